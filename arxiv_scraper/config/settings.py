@@ -5,11 +5,27 @@ Contains database, storage, and system settings optimized for academic paper col
 """
 
 import os
-from typing import Dict, Any, Optional
-from dataclasses import dataclass
+import functools
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Callable, TypeVar, Mapping
+from dataclasses import dataclass, field
 
 
-@dataclass
+T = TypeVar("T")
+
+
+def _env(key: str, default: T, cast: Callable[[str], T] = str) -> T:
+    """Read an environment variable once and coerce it, falling back to default."""
+    value = os.environ.get(key)
+    return cast(value) if value is not None else default
+
+
+def _as_bool(value: str) -> bool:
+    """Coerce an environment string to a boolean flag."""
+    return value.lower() == "true"
+
+
+@dataclass(slots=True, frozen=True)
 class DatabaseConfig:
     """MongoDB database configuration."""
     host: str = "localhost"
@@ -24,7 +40,7 @@ class DatabaseConfig:
     log_path: str = "/mnt/data/mongodb/logs"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class StorageConfig:
     """Storage configuration for PDF files."""
     base_path: str = "/mnt/data/arxiv_papers"
@@ -33,25 +49,20 @@ class StorageConfig:
     books_subdir: str = "books" 
     articles_subdir: str = "articles"
     temp_dir: str = "temp"
-    
-    @property
-    def papers_path(self) -> str:
-        return os.path.join(self.base_path, self.papers_subdir)
-    
-    @property
-    def books_path(self) -> str:
-        return os.path.join(self.base_path, self.books_subdir)
-        
-    @property
-    def articles_path(self) -> str:
-        return os.path.join(self.base_path, self.articles_subdir)
-        
-    @property
-    def temp_path(self) -> str:
-        return os.path.join(self.base_path, self.temp_dir)
+    papers_path: str = field(init=False)
+    books_path: str = field(init=False)
+    articles_path: str = field(init=False)
+    temp_path: str = field(init=False)
+
+    def __post_init__(self):
+        """Resolve the storage subdirectory paths once."""
+        object.__setattr__(self, "papers_path", os.path.join(self.base_path, self.papers_subdir))
+        object.__setattr__(self, "books_path", os.path.join(self.base_path, self.books_subdir))
+        object.__setattr__(self, "articles_path", os.path.join(self.base_path, self.articles_subdir))
+        object.__setattr__(self, "temp_path", os.path.join(self.base_path, self.temp_dir))
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ScrapingConfig:
     """Configuration for web scraping and API access."""
     arxiv_base_url: str = "http://export.arxiv.org/api/query"
@@ -62,7 +73,7 @@ class ScrapingConfig:
     user_agent: str = "arXiv-Scraper/1.0 (Academic Research)"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ProcessingConfig:
     """Configuration for data processing and analysis."""
     batch_size: int = 100
@@ -81,57 +92,62 @@ class Settings:
         self.storage = self._init_storage_config()
         self.scraping = self._init_scraping_config()
         self.processing = self._init_processing_config()
+        self._dict_view = self._build_dict_view()
         
     def _init_database_config(self) -> DatabaseConfig:
         """Initialize database configuration with environment overrides."""
         return DatabaseConfig(
-            host=os.getenv("MONGODB_HOST", "localhost"),
-            port=int(os.getenv("MONGODB_PORT", "27017")),
-            database_name=os.getenv("MONGODB_DATABASE", "arxiv_scraper"),
-            username=os.getenv("MONGODB_USERNAME"),
-            password=os.getenv("MONGODB_PASSWORD"),
-            max_pool_size=int(os.getenv("MONGODB_MAX_POOL_SIZE", "50")),
-            min_pool_size=int(os.getenv("MONGODB_MIN_POOL_SIZE", "10")),
-            timeout_ms=int(os.getenv("MONGODB_TIMEOUT_MS", "30000")),
-            data_path=os.getenv("MONGODB_DATA_PATH", "/mnt/data/mongodb/data"),
-            log_path=os.getenv("MONGODB_LOG_PATH", "/mnt/data/mongodb/logs"),
+            host=_env("MONGODB_HOST", "localhost"),
+            port=_env("MONGODB_PORT", 27017, int),
+            database_name=_env("MONGODB_DATABASE", "arxiv_scraper"),
+            username=_env("MONGODB_USERNAME", None),
+            password=_env("MONGODB_PASSWORD", None),
+            max_pool_size=_env("MONGODB_MAX_POOL_SIZE", 50, int),
+            min_pool_size=_env("MONGODB_MIN_POOL_SIZE", 10, int),
+            timeout_ms=_env("MONGODB_TIMEOUT_MS", 30000, int),
+            data_path=_env("MONGODB_DATA_PATH", "/mnt/data/mongodb/data"),
+            log_path=_env("MONGODB_LOG_PATH", "/mnt/data/mongodb/logs"),
         )
         
     def _init_storage_config(self) -> StorageConfig:
         """Initialize storage configuration with environment overrides."""
         return StorageConfig(
-            base_path=os.getenv("STORAGE_BASE_PATH", "/mnt/data/arxiv_papers"),
-            max_storage_gb=int(os.getenv("MAX_STORAGE_GB", "300")),
-            papers_subdir=os.getenv("PAPERS_SUBDIR", "papers"),
-            books_subdir=os.getenv("BOOKS_SUBDIR", "books"),
-            articles_subdir=os.getenv("ARTICLES_SUBDIR", "articles"),
-            temp_dir=os.getenv("TEMP_DIR", "temp"),
+            base_path=_env("STORAGE_BASE_PATH", "/mnt/data/arxiv_papers"),
+            max_storage_gb=_env("MAX_STORAGE_GB", 300, int),
+            papers_subdir=_env("PAPERS_SUBDIR", "papers"),
+            books_subdir=_env("BOOKS_SUBDIR", "books"),
+            articles_subdir=_env("ARTICLES_SUBDIR", "articles"),
+            temp_dir=_env("TEMP_DIR", "temp"),
         )
         
     def _init_scraping_config(self) -> ScrapingConfig:
         """Initialize scraping configuration with environment overrides."""
         return ScrapingConfig(
-            arxiv_base_url=os.getenv("ARXIV_BASE_URL", "http://export.arxiv.org/api/query"),
-            arxiv_rate_limit_seconds=float(os.getenv("ARXIV_RATE_LIMIT_SECONDS", "3.0")),
-            max_concurrent_downloads=int(os.getenv("MAX_CONCURRENT_DOWNLOADS", "5")),
-            request_timeout_seconds=int(os.getenv("REQUEST_TIMEOUT_SECONDS", "30")),
-            max_retries=int(os.getenv("MAX_RETRIES", "3")),
-            user_agent=os.getenv("USER_AGENT", "arXiv-Scraper/1.0 (Academic Research)"),
+            arxiv_base_url=_env("ARXIV_BASE_URL", "http://export.arxiv.org/api/query"),
+            arxiv_rate_limit_seconds=_env("ARXIV_RATE_LIMIT_SECONDS", 3.0, float),
+            max_concurrent_downloads=_env("MAX_CONCURRENT_DOWNLOADS", 5, int),
+            request_timeout_seconds=_env("REQUEST_TIMEOUT_SECONDS", 30, int),
+            max_retries=_env("MAX_RETRIES", 3, int),
+            user_agent=_env("USER_AGENT", "arXiv-Scraper/1.0 (Academic Research)"),
         )
         
     def _init_processing_config(self) -> ProcessingConfig:
         """Initialize processing configuration with environment overrides."""
         return ProcessingConfig(
-            batch_size=int(os.getenv("BATCH_SIZE", "100")),
-            max_workers=int(os.getenv("MAX_WORKERS", "4")),
-            enable_text_extraction=os.getenv("ENABLE_TEXT_EXTRACTION", "true").lower() == "true",
-            enable_nlp_preprocessing=os.getenv("ENABLE_NLP_PREPROCESSING", "false").lower() == "true",
-            log_level=os.getenv("LOG_LEVEL", "INFO"),
+            batch_size=_env("BATCH_SIZE", 100, int),
+            max_workers=_env("MAX_WORKERS", 4, int),
+            enable_text_extraction=_env("ENABLE_TEXT_EXTRACTION", True, _as_bool),
+            enable_nlp_preprocessing=_env("ENABLE_NLP_PREPROCESSING", False, _as_bool),
+            log_level=_env("LOG_LEVEL", "INFO"),
         )
         
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert settings to dictionary format."""
-        return {
+    def to_dict(self) -> Mapping[str, Any]:
+        """Convert settings to a read-only dictionary view."""
+        return self._dict_view
+
+    def _build_dict_view(self) -> Mapping[str, Any]:
+        """Build the read-only settings view once; the config sections are frozen."""
+        sections: Dict[str, Dict[str, Any]] = {
             "database": {
                 "host": self.database.host,
                 "port": self.database.port,
@@ -166,22 +182,18 @@ class Settings:
                 "log_level": self.processing.log_level,
             }
         }
+        return MappingProxyType({
+            name: MappingProxyType(values) for name, values in sections.items()
+        })
 
 
-# Global settings instance
-_settings: Optional[Settings] = None
-
-
+@functools.lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Get global settings instance."""
-    global _settings
-    if _settings is None:
-        _settings = Settings()
-    return _settings
+    return Settings()
 
 
 def reload_settings():
     """Reload settings from environment variables."""
-    global _settings
-    _settings = None
-    return get_settings()
\ No newline at end of file
+    get_settings.cache_clear()
+    return get_settings()
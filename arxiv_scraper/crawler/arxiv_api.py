@@ -6,64 +6,172 @@ from the arXiv API with focus on AI, ML, and computer science topics.
 """
 
 import asyncio
+import functools
+import io
+import itertools
 import logging
 import re
-import xml.etree.ElementTree as ET
-from datetime import datetime, timedelta
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from types import MappingProxyType
 from typing import Dict, List, Optional, Any, Tuple
 from urllib.parse import quote_plus
 
 import aiohttp
+from lxml import etree
+from ..config.settings import get_settings
 from ..utils.rate_limiter import RateLimiter
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+ATOM_NS = "http://www.w3.org/2005/Atom"
+ARXIV_NS = "http://arxiv.org/schemas/atom"
+ARXIV_NAMESPACES = MappingProxyType({"atom": ATOM_NS, "arxiv": ARXIV_NS})
+
+# AI/ML related categories for focused crawling
+AI_ML_CATEGORIES: Tuple[str, ...] = (
+    "cs.AI",  # Artificial Intelligence
+    "cs.LG",  # Machine Learning
+    "cs.CV",  # Computer Vision
+    "cs.CL",  # Computation and Language
+    "cs.NE",  # Neural and Evolutionary Computing
+    "stat.ML",  # Machine Learning (Statistics)
+    "cs.IR",  # Information Retrieval
+    "cs.RO",  # Robotics
+    "cs.HC",  # Human-Computer Interaction
+    "cs.SD",  # Sound (includes speech recognition)
+)
+
+# Clark-notation tags for the Atom/arXiv elements read from each entry
+_ATOM = f"{{{ATOM_NS}}}"
+_ARXIV = f"{{{ARXIV_NS}}}"
+_ID_TAG = _ATOM + "id"
+_TITLE_TAG = _ATOM + "title"
+_SUMMARY_TAG = _ATOM + "summary"
+_PUBLISHED_TAG = _ATOM + "published"
+_UPDATED_TAG = _ATOM + "updated"
+_ENTRY_TAG = _ATOM + "entry"
+
+# Compiled XPath expressions for the list-valued entry fields; plain str
+# results avoid keeping a back-reference to the parsed element
+_XPATH_OPTIONS = {"namespaces": dict(ARXIV_NAMESPACES), "smart_strings": False}
+_AUTHOR_NAMES_XP = etree.XPath("./atom:author/atom:name/text()", **_XPATH_OPTIONS)
+_PRIMARY_CATEGORY_TERMS_XP = etree.XPath("./arxiv:primary_category/@term", **_XPATH_OPTIONS)
+_CATEGORY_TERMS_XP = etree.XPath("./atom:category/@term", **_XPATH_OPTIONS)
+_PDF_URL_XP = etree.XPath("./atom:link[@type='application/pdf'][1]/@href", **_XPATH_OPTIONS)
+
+_READ_CHUNK_SIZE = 64 * 1024
+
+_QUERY_SORT_SUFFIX = "&sortBy=submittedDate&sortOrder=descending"
+
+_ARXIV_ID_RE = re.compile(r"arxiv\.org/abs/(.+)$")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=128)
+def _build_query_url(base_url: str, categories: Tuple[str, ...], max_results: int) -> str:
+    """Build (and memoize) the arXiv API query URL for a category set."""
+    # Simplified query - just use categories without complex date filtering
+    if categories:
+        # Use OR to get papers from any of the specified categories
+        category_query = " OR ".join([f"cat:{cat}" for cat in categories])
+        search_query = f"({category_query})"
+    else:
+        search_query = "cat:cs.AI"
+    
+    # Only the search query and result cap vary; the paging/sort params are constant
+    max_results = min(max_results, 2000)  # arXiv API limit
+    return (
+        f"{base_url}?search_query={quote_plus(search_query)}"
+        f"&start=0&max_results={max_results}{_QUERY_SORT_SUFFIX}"
+    )
+
+
+@dataclass(slots=True)
+class ArxivPaper:
+    """Parsed arXiv entry, kept compact while a response is in flight."""
+    paper_id: str
+    title: str
+    authors: List[str]
+    abstract: str
+    categories: List[str]
+    date_published: Optional[datetime]
+    date_updated: Optional[datetime]
+    pdf_url: Optional[str]
+    entry_id: Optional[str]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the paper metadata dictionary used for storage."""
+        return {
+            "paper_id": self.paper_id,
+            "source": "arxiv",
+            "title": self.title,
+            "authors": self.authors,
+            "abstract": self.abstract,
+            "categories": self.categories,
+            "date_published": self.date_published,
+            "date_updated": self.date_updated,
+            "pdf_url": self.pdf_url,
+            "pdf_downloaded": False,
+            "pdf_file_path": None,
+            "pdf_file_size": None,
+            "source_metadata": {
+                "arxiv_id": self.paper_id,
+                "primary_category": self.categories[0] if self.categories else None,
+                "all_categories": self.categories,
+                "entry_id": self.entry_id,
+            },
+            "processing_status": "pending"
+        }
+
 
 class ArxivAPIClient:
     """Client for interacting with the arXiv API."""
     
-    BASE_URL = "http://export.arxiv.org/api/query"
-    NAMESPACE = {"atom": "http://www.w3.org/2005/Atom", "arxiv": "http://arxiv.org/schemas/atom"}
+    NAMESPACE = ARXIV_NAMESPACES
+    AI_ML_CATEGORIES = AI_ML_CATEGORIES
     
-    # AI/ML related categories for focused crawling
-    AI_ML_CATEGORIES = [
-        "cs.AI",  # Artificial Intelligence
-        "cs.LG",  # Machine Learning
-        "cs.CV",  # Computer Vision
-        "cs.CL",  # Computation and Language
-        "cs.NE",  # Neural and Evolutionary Computing
-        "stat.ML",  # Machine Learning (Statistics)
-        "cs.IR",  # Information Retrieval
-        "cs.RO",  # Robotics
-        "cs.HC",  # Human-Computer Interaction
-        "cs.SD",  # Sound (includes speech recognition)
-    ]
-    
-    def __init__(self, rate_limit_delay: float = 3.0):
+    def __init__(self, rate_limit_delay: Optional[float] = None):
         """
         Initialize arXiv API client.
         
         Args:
-            rate_limit_delay: Delay between API requests (arXiv requires 3+ seconds)
+            rate_limit_delay: Delay between API requests (arXiv requires 3+ seconds);
+                defaults to the configured arxiv_rate_limit_seconds
         """
+        scraping = get_settings().scraping
+        self._base_url = scraping.arxiv_base_url
+        self._timeout = scraping.request_timeout_seconds
+        self._user_agent = scraping.user_agent
+        if rate_limit_delay is None:
+            rate_limit_delay = scraping.arxiv_rate_limit_seconds
         self.rate_limiter = RateLimiter(delay=rate_limit_delay)
         self.session: Optional[aiohttp.ClientSession] = None
         
     async def __aenter__(self):
         """Async context manager entry."""
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=30),
-            headers={
-                "User-Agent": "arXiv-Scraper/1.0 (Research Purpose; Contact: admin@example.com)"
-            }
-        )
+        await self._ensure_session()
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
-        if self.session:
+        await self.close()
+    
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """Create the HTTP session on first use and reuse it for later requests."""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self._timeout),
+                headers={"User-Agent": self._user_agent}
+            )
+        return self.session
+    
+    async def close(self):
+        """Close the HTTP session and its keep-alive connections."""
+        if self.session and not self.session.closed:
             await self.session.close()
+        self.session = None
     
     def build_search_query(self, 
                           categories: List[str] = None, 
@@ -84,32 +192,19 @@ class ArxivAPIClient:
         Returns:
             Formatted query string for arXiv API
         """
-        # Simplified query - just use categories without complex date filtering
-        if categories:
-            # Use OR to get papers from any of the specified categories
-            category_query = " OR ".join([f"cat:{cat}" for cat in categories])
-            search_query = f"({category_query})"
-        else:
-            search_query = "cat:cs.AI"
-        
-        # Build basic query parameters without date filtering initially
-        params = {
-            "search_query": search_query,
-            "start": 0,
-            "max_results": min(max_results, 2000),  # arXiv API limit
-            "sortBy": "submittedDate",
-            "sortOrder": "descending"
-        }
-        
-        # Convert to query string
-        query_string = "&".join([f"{k}={quote_plus(str(v))}" for k, v in params.items()])
-        return f"{self.BASE_URL}?{query_string}"
+        # Keywords and dates are not part of the query yet, so only categories,
+        # the result cap and the endpoint determine the URL
+        return _build_query_url(
+            self._base_url,
+            tuple(categories) if categories else (),
+            max_results
+        )
     
     async def fetch_papers(self, 
                           categories: List[str] = None,
                           keywords: List[str] = None,
                           max_results: int = 100,
-                          days_back: int = 30) -> List[Dict[str, Any]]:
+                          days_back: int = 30) -> List[ArxivPaper]:
         """
         Fetch papers from arXiv API.
         
@@ -120,7 +215,7 @@ class ArxivAPIClient:
             days_back: How many days back to search
             
         Returns:
-            List of paper metadata dictionaries
+            List of parsed papers
         """
         if not categories:
             categories = self.AI_ML_CATEGORIES
@@ -136,52 +231,136 @@ class ArxivAPIClient:
         logger.debug(f"Query URL: {query_url}")
         
         try:
+            session = await self._ensure_session()
             await self.rate_limiter.wait()
             
-            async with self.session.get(query_url) as response:
+            async with session.get(query_url) as response:
                 if response.status != 200:
                     logger.error(f"arXiv API request failed: {response.status}")
                     return []
                 
-                xml_content = await response.text()
-                return self.parse_arxiv_response(xml_content)
+                # Parse entries as chunks arrive instead of buffering the whole body
+                parser = etree.XMLPullParser(events=("end",), tag=_ENTRY_TAG)
+                papers: List[ArxivPaper] = []
+                async for chunk in response.content.iter_chunked(_READ_CHUNK_SIZE):
+                    parser.feed(chunk)
+                    self._collect_entries(parser.read_events(), papers)
+                parser.close()
+                self._collect_entries(parser.read_events(), papers)
+                
+                logger.info(f"Parsed {len(papers)} papers from arXiv response")
+                return papers
                 
+        except etree.XMLSyntaxError as e:
+            logger.error(f"Failed to parse arXiv XML response: {e}")
+            return []
         except Exception as e:
             logger.error(f"Error fetching papers from arXiv: {e}")
             return []
     
-    def parse_arxiv_response(self, xml_content: str) -> List[Dict[str, Any]]:
+    async def fetch_papers_sharded(self,
+                                   categories: List[str] = None,
+                                   keywords: List[str] = None,
+                                   max_results: int = 100,
+                                   days_back: int = 30,
+                                   shard_size: int = 3) -> List[ArxivPaper]:
+        """
+        Fetch papers with one concurrent arXiv query per shard of categories.
+        
+        Each shard is requested with the full result budget so the merged,
+        date-sorted list still holds the most recent papers overall. Requests
+        are spaced by the shared rate limiter; overlap comes from responses
+        downloading and parsing while later shards wait for their slot.
+        
+        Args:
+            categories: arXiv categories to search (defaults to AI/ML categories)
+            keywords: Additional keywords to search for
+            max_results: Maximum number of papers to return
+            days_back: How many days back to search
+            shard_size: Number of categories per query
+            
+        Returns:
+            List of parsed papers, newest first
+        """
+        if not categories:
+            categories = self.AI_ML_CATEGORIES
+        
+        shards = [categories[i:i + shard_size] for i in range(0, len(categories), shard_size)]
+        if len(shards) == 1:
+            return await self.fetch_papers(shards[0], keywords, max_results, days_back)
+        
+        results = await asyncio.gather(*(
+            self.fetch_papers(shard, keywords, max_results, days_back) for shard in shards
+        ))
+        
+        # Papers cross-listed in several shards are returned once
+        papers_by_id: Dict[str, ArxivPaper] = {}
+        for shard_papers in results:
+            for paper in shard_papers:
+                papers_by_id.setdefault(paper.paper_id, paper)
+        
+        papers = sorted(
+            papers_by_id.values(),
+            key=lambda paper: paper.date_published or datetime.min.replace(tzinfo=timezone.utc),
+            reverse=True
+        )
+        return papers[:max_results]
+    
+    def parse_arxiv_response(self, xml_content: bytes) -> List[ArxivPaper]:
         """
         Parse XML response from arXiv API.
         
+        Entries are stream-parsed one at a time and released once converted,
+        so large responses never hold a full element tree in memory.
+        
         Args:
-            xml_content: XML response from arXiv API
+            xml_content: Raw XML response bytes from arXiv API
             
         Returns:
-            List of parsed paper metadata
+            List of parsed papers
         """
         try:
-            root = ET.fromstring(xml_content)
-            papers = []
-            
-            entries = root.findall(".//atom:entry", self.NAMESPACE)
-            logger.info(f"Parsing {len(entries)} papers from arXiv response")
-            
-            for entry in entries:
-                paper_data = self.parse_paper_entry(entry)
-                if paper_data:
-                    papers.append(paper_data)
+            papers: List[ArxivPaper] = []
+            entry_count = self._collect_entries(
+                etree.iterparse(io.BytesIO(xml_content), tag=_ENTRY_TAG), papers
+            )
             
+            logger.info(f"Parsed {entry_count} papers from arXiv response")
             return papers
             
-        except ET.ParseError as e:
+        except etree.XMLSyntaxError as e:
             logger.error(f"Failed to parse arXiv XML response: {e}")
             return []
         except Exception as e:
             logger.error(f"Unexpected error parsing arXiv response: {e}")
             return []
     
-    def parse_paper_entry(self, entry: ET.Element) -> Optional[Dict[str, Any]]:
+    def _collect_entries(self, events, papers: List[ArxivPaper]) -> int:
+        """
+        Convert parsed <entry> events into papers, releasing each element.
+        
+        Args:
+            events: Iterable of (event, element) pairs for entry elements
+            papers: List that parsed papers are appended to
+            
+        Returns:
+            Number of entries seen
+        """
+        entry_count = 0
+        for _, entry in events:
+            entry_count += 1
+            paper = self.parse_paper_entry(entry)
+            if paper:
+                papers.append(paper)
+            
+            # Drop the parsed entry and any already-processed siblings
+            entry.clear()
+            while entry.getprevious() is not None:
+                del entry.getparent()[0]
+        
+        return entry_count
+    
+    def parse_paper_entry(self, entry: etree._Element) -> Optional[ArxivPaper]:
         """
         Parse a single paper entry from arXiv XML.
         
@@ -189,96 +368,89 @@ class ArxivAPIClient:
             entry: XML entry element for a paper
             
         Returns:
-            Paper metadata dictionary or None if parsing fails
+            Parsed paper or None if parsing fails
         """
         try:
+            id_elem = title_elem = summary_elem = published_elem = updated_elem = None
+            
+            # Single pass over the entry's children for the scalar fields
+            for child in entry:
+                tag = child.tag
+                if tag == _ID_TAG:
+                    id_elem = child
+                elif tag == _TITLE_TAG:
+                    title_elem = child
+                elif tag == _SUMMARY_TAG:
+                    summary_elem = child
+                elif tag == _PUBLISHED_TAG:
+                    published_elem = child
+                elif tag == _UPDATED_TAG:
+                    updated_elem = child
+            
             # Extract basic information
-            arxiv_id = self.extract_arxiv_id(entry.find("atom:id", self.NAMESPACE))
+            arxiv_id = self.extract_arxiv_id(id_elem)
             if not arxiv_id:
                 return None
             
-            title = self.clean_text(entry.find("atom:title", self.NAMESPACE))
-            summary = self.clean_text(entry.find("atom:summary", self.NAMESPACE))
+            title = self.clean_text(title_elem)
+            summary = self.clean_text(summary_elem)
             
-            # Extract authors
-            authors = []
-            for author in entry.findall(".//atom:author", self.NAMESPACE):
-                name_elem = author.find("atom:name", self.NAMESPACE)
-                if name_elem is not None and name_elem.text:
-                    authors.append(name_elem.text.strip())
+            # List-valued fields come straight from compiled XPath expressions
+            authors = [name.strip() for name in _AUTHOR_NAMES_XP(entry)]
             
-            # Extract categories
+            # Primary category first, then the remaining categories in document order
             categories = []
-            for category in entry.findall(".//arxiv:primary_category", self.NAMESPACE):
-                if category.get("term"):
-                    categories.append(category.get("term"))
+            seen_categories = set()
+            for term in itertools.chain(_PRIMARY_CATEGORY_TERMS_XP(entry), _CATEGORY_TERMS_XP(entry)):
+                if term and term not in seen_categories:
+                    seen_categories.add(term)
+                    categories.append(term)
             
-            for category in entry.findall(".//atom:category", self.NAMESPACE):
-                if category.get("term") and category.get("term") not in categories:
-                    categories.append(category.get("term"))
+            pdf_links = _PDF_URL_XP(entry)
+            pdf_url = pdf_links[0] if pdf_links else None
             
             # Extract dates
-            published = self.parse_date(entry.find("atom:published", self.NAMESPACE))
-            updated = self.parse_date(entry.find("atom:updated", self.NAMESPACE))
-            
-            # Extract PDF link
-            pdf_url = None
-            for link in entry.findall("atom:link", self.NAMESPACE):
-                if link.get("type") == "application/pdf":
-                    pdf_url = link.get("href")
-                    break
-            
-            # Build paper data structure
-            paper_data = {
-                "paper_id": arxiv_id,
-                "source": "arxiv",
-                "title": title,
-                "authors": authors,
-                "abstract": summary,
-                "categories": categories,
-                "date_published": published,
-                "date_updated": updated,
-                "pdf_url": pdf_url,
-                "pdf_downloaded": False,
-                "pdf_file_path": None,
-                "pdf_file_size": None,
-                "source_metadata": {
-                    "arxiv_id": arxiv_id,
-                    "primary_category": categories[0] if categories else None,
-                    "all_categories": categories,
-                    "entry_id": entry.find("atom:id", self.NAMESPACE).text if entry.find("atom:id", self.NAMESPACE) is not None else None,
-                },
-                "processing_status": "pending"
-            }
+            published = self.parse_date(published_elem)
+            updated = self.parse_date(updated_elem)
             
-            return paper_data
+            return ArxivPaper(
+                paper_id=arxiv_id,
+                title=title,
+                authors=authors,
+                abstract=summary,
+                categories=categories,
+                date_published=published,
+                date_updated=updated,
+                pdf_url=pdf_url,
+                entry_id=id_elem.text,
+            )
             
         except Exception as e:
             logger.warning(f"Failed to parse paper entry: {e}")
             return None
     
-    def extract_arxiv_id(self, id_element: Optional[ET.Element]) -> Optional[str]:
+    def extract_arxiv_id(self, id_element: Optional[etree._Element]) -> Optional[str]:
         """Extract arXiv ID from ID element."""
         if id_element is None or not id_element.text:
             return None
         
         # Extract arXiv ID from full URL
-        match = re.search(r"arxiv\.org/abs/(.+)$", id_element.text)
+        match = _ARXIV_ID_RE.search(id_element.text)
         if match:
             return match.group(1)
         
         return None
     
-    def clean_text(self, element: Optional[ET.Element]) -> str:
+    def clean_text(self, element: Optional[etree._Element]) -> str:
         """Clean and normalize text content."""
         if element is None or not element.text:
             return ""
         
         # Remove extra whitespace and newlines
-        text = re.sub(r'\s+', ' ', element.text.strip())
+        text = _WHITESPACE_RE.sub(' ', element.text.strip())
         return text
     
-    def parse_date(self, date_element: Optional[ET.Element]) -> Optional[datetime]:
+    def parse_date(self, date_element: Optional[etree._Element]) -> Optional[datetime]:
         """Parse date from XML element."""
         if date_element is None or not date_element.text:
             return None
@@ -286,6 +458,13 @@ class ArxivAPIClient:
         try:
             # arXiv uses ISO format: 2023-01-15T10:30:00Z
             date_str = date_element.text.strip()
+            if len(date_str) == 20 and date_str[-1] == 'Z':
+                return datetime(
+                    int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]),
+                    int(date_str[11:13]), int(date_str[14:16]), int(date_str[17:19]),
+                    tzinfo=timezone.utc
+                )
+            
             if date_str.endswith('Z'):
                 date_str = date_str[:-1] + '+00:00'
             
@@ -298,16 +477,29 @@ class ArxivAPIClient:
 class ArxivCrawler:
     """Main crawler class for arXiv papers."""
     
-    def __init__(self, rate_limit_delay: float = 3.0):
+    def __init__(self, rate_limit_delay: Optional[float] = None):
         """
         Initialize arXiv crawler.
         
         Args:
-            rate_limit_delay: Delay between API requests
+            rate_limit_delay: Delay between API requests (defaults to settings)
         """
         self.api_client = ArxivAPIClient(rate_limit_delay)
         self.logger = get_logger(self.__class__.__name__)
     
+    async def __aenter__(self):
+        """Async context manager entry."""
+        await self.api_client._ensure_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.close()
+    
+    async def close(self):
+        """Release the shared arXiv API session."""
+        await self.api_client.close()
+    
     async def crawl_ai_ml_papers(self, 
                                 max_papers: int = 100,
                                 days_back: int = 30,
@@ -335,17 +527,16 @@ class ArxivCrawler:
         if additional_keywords:
             ai_ml_keywords.extend(additional_keywords)
         
-        async with self.api_client:
-            # Fetch papers with AI/ML categories and keywords
-            papers = await self.api_client.fetch_papers(
-                categories=ArxivAPIClient.AI_ML_CATEGORIES,
-                keywords=ai_ml_keywords[:5],  # Limit keywords to avoid query complexity
-                max_results=max_papers,
-                days_back=days_back
-            )
-            
-            self.logger.info(f"Crawled {len(papers)} AI/ML papers from arXiv")
-            return papers
+        # Fetch papers with AI/ML categories and keywords
+        papers = await self.api_client.fetch_papers_sharded(
+            categories=ArxivAPIClient.AI_ML_CATEGORIES,
+            keywords=ai_ml_keywords[:5],  # Limit keywords to avoid query complexity
+            max_results=max_papers,
+            days_back=days_back
+        )
+        
+        self.logger.info(f"Crawled {len(papers)} AI/ML papers from arXiv")
+        return [paper.to_dict() for paper in papers]
     
     async def crawl_specific_categories(self, 
                                       categories: List[str],
@@ -364,15 +555,14 @@ class ArxivCrawler:
         """
         self.logger.info(f"Starting category-specific crawl: {categories}")
         
-        async with self.api_client:
-            papers = await self.api_client.fetch_papers(
-                categories=categories,
-                max_results=max_papers,
-                days_back=days_back
-            )
-            
-            self.logger.info(f"Crawled {len(papers)} papers from categories: {categories}")
-            return papers
+        papers = await self.api_client.fetch_papers_sharded(
+            categories=categories,
+            max_results=max_papers,
+            days_back=days_back
+        )
+        
+        self.logger.info(f"Crawled {len(papers)} papers from categories: {categories}")
+        return [paper.to_dict() for paper in papers]
 
 
 # Convenience function for quick testing
@@ -386,5 +576,5 @@ async def crawl_test_papers(max_papers: int = 20) -> List[Dict[str, Any]]:
     Returns:
         List of paper metadata dictionaries
     """
-    crawler = ArxivCrawler()
-    return await crawler.crawl_ai_ml_papers(max_papers=max_papers, days_back=7)
\ No newline at end of file
+    async with ArxivCrawler() as crawler:
+        return await crawler.crawl_ai_ml_papers(max_papers=max_papers, days_back=7)
\ No newline at end of file
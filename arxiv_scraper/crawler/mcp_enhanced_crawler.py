@@ -4,42 +4,92 @@ Uses arXiv MCP, Fetch MCP, and Playwright MCP for content discovery.
 """
 
 import asyncio
+import functools
 import logging
-from dataclasses import dataclass
+import os
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 
-from ..mcp_servers.client_manager import mcp_manager
+from ..config.settings import get_settings
+from ..mcp_servers.client_manager import MCPRateLimitError, mcp_manager
+from ..utils.bloom_filter import BloomFilter
 from ..utils.logger import get_logger
 from ..utils.rate_limiter import RateLimiter
 
+# arXiv links, PDF links and anything mentioning "paper", matched in one scan
+_PAPER_URL_RE = re.compile(
+    r'https?://(?:arxiv\.org/[^\s<>"]+|[^\s<>"]*\.pdf[^\s<>"]*|[^\s<>"]*paper[^\s<>"]*)'
+)
+_PAPER_URL_INDICATOR_RE = re.compile(
+    r"arxiv\.org|\.pdf|paper|publication|doi\.org", re.IGNORECASE
+)
 
-@dataclass
+# Parsed Fetch MCP results kept per URL for the lifetime of the agent
+_FETCH_CACHE_SIZE = 512
+
+# In-flight tool calls allowed per MCP server
+_SERVER_CONCURRENCY = {"fetch": 20, "playwright": 5, "arxiv": 1}
+
+# Characters of page content kept as a paper's abstract
+_ABSTRACT_CHARS = 500
+
+# Paper URLs successfully crawled in earlier runs, kept under the storage root
+_PROCESSED_URLS_FILE = "processed_paper_urls.bloom"
+
+
+def _abstract_preview(content: str) -> str:
+    """Return the leading slice of page content used as an abstract."""
+    if len(content) <= _ABSTRACT_CHARS:
+        return content
+    return f"{content[:_ABSTRACT_CHARS]}..."
+
+
+@dataclass(slots=True)
 class CrawlResult:
     source: str
     papers: List[Dict[str, Any]]
     success: bool
     error_message: Optional[str] = None
-    crawl_timestamp: datetime = None
-
-    def __post_init__(self):
-        if self.crawl_timestamp is None:
-            self.crawl_timestamp = datetime.utcnow()
+    crawl_timestamp: datetime = field(default_factory=datetime.utcnow)
 
 
 class MCPEnhancedCrawlerAgent:
     def __init__(self):
         self.logger = get_logger(__name__)
-        self.rate_limiter = RateLimiter()
+        self.rate_limiter = RateLimiter(delay=0.1, burst_size=10)  # ~10 req/s
         self.arxiv_rate_limiter = RateLimiter(delay=3.0)  # arXiv requires 3s delay
+        self.concurrency = asyncio.Semaphore(10)
+        self._server_semaphores = {
+            server: asyncio.Semaphore(limit)
+            for server, limit in _SERVER_CONCURRENCY.items()
+        }
+        # navigate + extract_content act on the Playwright server's single page
+        self._playwright_page_lock = asyncio.Lock()
+        self._fetch_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Paper URLs already handed out by extract_paper_urls this session
+        self._seen_paper_urls: Set[str] = set()
+        # Paper URLs crawled successfully in this or earlier runs; loaded in initialize()
+        self._processed_urls_path = os.path.join(
+            get_settings().storage.base_path, _PROCESSED_URLS_FILE
+        )
+        self._processed_paper_urls = BloomFilter()
 
     async def initialize(self) -> bool:
         """Initialize MCP connections required for crawling."""
-        required_servers = ["arxiv", "fetch", "playwright"]
-        connection_results = {}
+        await self._load_processed_paper_urls()
 
-        for server in required_servers:
-            connection_results[server] = await mcp_manager.connect_server(server)
+        required_servers = ["arxiv", "fetch", "playwright"]
+        results = await asyncio.gather(
+            *(mcp_manager.connect_server(server) for server in required_servers),
+            return_exceptions=True,
+        )
+        # An exception counts as a failed connection, not a truthy result
+        connection_results = {
+            server: result is True for server, result in zip(required_servers, results)
+        }
 
         success_count = sum(connection_results.values())
         self.logger.info(
@@ -68,15 +118,24 @@ class MCPEnhancedCrawlerAgent:
             )
 
         try:
-            await self.arxiv_rate_limiter.wait()
-
             parameters = {"query": query, "max_results": max_results}
 
             if date_range:
                 parameters["date_from"] = date_range[0]
                 parameters["date_to"] = date_range[1]
 
-            response = await mcp_manager.call_tool("arxiv", "search_papers", parameters)
+            await self.arxiv_rate_limiter.wait()
+            try:
+                response = await self._call_tool("arxiv", "search_papers", parameters)
+            except MCPRateLimitError as e:
+                # Honour the server's Retry-After once before giving up
+                retry_after = e.retry_after or self.arxiv_rate_limiter.delay
+                self.logger.warning(
+                    f"arXiv MCP rate limited, retrying in {retry_after:.1f}s"
+                )
+                await asyncio.sleep(retry_after)
+                await self.arxiv_rate_limiter.wait()
+                response = await self._call_tool("arxiv", "search_papers", parameters)
 
             papers = response.get("papers", [])
             self.logger.info(
@@ -91,6 +150,27 @@ class MCPEnhancedCrawlerAgent:
                 source="arxiv", papers=[], success=False, error_message=str(e)
             )
 
+    async def crawl_arxiv_many(
+        self, queries: List[str], max_results: int = 100, date_range: tuple = None
+    ) -> List[CrawlResult]:
+        """
+        Run several arXiv MCP queries concurrently.
+
+        Each query still takes its own arXiv rate-limiter slot, so requests
+        stay spaced while their round-trips overlap.
+
+        Args:
+            queries: arXiv search queries (e.g., one per category)
+            max_results: Maximum number of papers to fetch per query
+            date_range: Tuple of (start_date, end_date) as strings
+
+        Returns:
+            One CrawlResult per query, in input order
+        """
+        return await asyncio.gather(
+            *(self.crawl_arxiv(query, max_results, date_range) for query in queries)
+        )
+
     async def crawl_web_sources(self, urls: List[str]) -> CrawlResult:
         """
         Crawl web sources using Playwright MCP for JavaScript-heavy sites.
@@ -106,36 +186,15 @@ class MCPEnhancedCrawlerAgent:
                 error_message="Playwright MCP server not connected",
             )
 
-        papers = []
-        errors = []
-
-        for url in urls:
-            try:
-                await self.rate_limiter.wait()
-
-                # Navigate to URL and extract content
-                nav_response = await mcp_manager.call_tool(
-                    "playwright", "navigate", {"url": url, "wait_for": "networkidle"}
-                )
-
-                if nav_response.get("success"):
-                    # Extract content from the page
-                    extract_response = await mcp_manager.call_tool(
-                        "playwright",
-                        "extract_content",
-                        {"selectors": ["article", ".paper", ".publication"]},
-                    )
-
-                    if extract_response.get("content"):
-                        paper_data = self._parse_web_content(
-                            extract_response["content"], url
-                        )
-                        papers.append(paper_data)
-
-            except Exception as e:
-                self.logger.error(f"Web crawl failed for {url}: {e}")
-                errors.append(f"{url}: {str(e)}")
+        # One crawl timestamp for the whole batch
+        crawled_at = datetime.utcnow().isoformat()
+        papers, errors = await self._gather_per_url(
+            urls,
+            functools.partial(self._crawl_web_source, crawled_at=crawled_at),
+            "Web crawl",
+        )
 
+        self._processed_paper_urls.update(paper["source_url"] for paper in papers)
         success = len(papers) > 0
         error_message = "; ".join(errors) if errors else None
 
@@ -163,25 +222,28 @@ class MCPEnhancedCrawlerAgent:
                 error_message="Fetch MCP server not connected",
             )
 
-        papers = []
-        errors = []
+        # One crawl timestamp for the whole batch, cache hits included
+        crawled_at = datetime.utcnow().isoformat()
 
+        # Serve repeated URLs from the cache without a rate-limit slot or round-trip
+        papers = []
+        pending_urls = []
         for url in urls:
-            try:
-                await self.rate_limiter.wait()
-
-                response = await mcp_manager.call_tool(
-                    "fetch", "fetch_content", {"url": url, "format": "markdown"}
-                )
-
-                if response.get("content"):
-                    paper_data = self._parse_fetched_content(response["content"], url)
-                    papers.append(paper_data)
-
-            except Exception as e:
-                self.logger.error(f"Fetch failed for {url}: {e}")
-                errors.append(f"{url}: {str(e)}")
+            cached = self._fetch_cache.get(url)
+            if cached is not None:
+                self._fetch_cache.move_to_end(url)
+                papers.append(dict(cached, date_crawled=crawled_at))
+            else:
+                pending_urls.append(url)
+
+        fetched, errors = await self._gather_per_url(
+            pending_urls,
+            functools.partial(self._fetch_content_url, crawled_at=crawled_at),
+            "Fetch",
+        )
+        papers.extend(fetched)
 
+        self._processed_paper_urls.update(paper["source_url"] for paper in fetched)
         success = len(papers) > 0
         error_message = "; ".join(errors) if errors else None
 
@@ -201,46 +263,25 @@ class MCPEnhancedCrawlerAgent:
         Returns:
             List of extracted paper URLs
         """
-        paper_urls = []
+        url_lists, _ = await self._gather_per_url(
+            source_urls, self._extract_urls_from_source, "URL extraction"
+        )
 
-        for url in source_urls:
-            try:
-                if mcp_manager.is_server_connected("playwright"):
-                    # Use Playwright for JavaScript-heavy pages
-                    await mcp_manager.call_tool("playwright", "navigate", {"url": url})
-
-                    response = await mcp_manager.call_tool(
-                        "playwright",
-                        "extract_content",
-                        {
-                            "selectors": [
-                                "a[href*='pdf']",
-                                "a[href*='paper']",
-                                "a[href*='arxiv']",
-                            ]
-                        },
-                    )
-
-                    if response.get("links"):
-                        paper_urls.extend(response["links"])
-
-                elif mcp_manager.is_server_connected("fetch"):
-                    # Use Fetch MCP as fallback
-                    response = await mcp_manager.call_tool(
-                        "fetch", "fetch_url", {"url": url}
-                    )
-
-                    # Basic URL extraction from content
-                    content = response.get("content", "")
-                    extracted_urls = self._extract_urls_from_content(content)
-                    paper_urls.extend(extracted_urls)
-
-            except Exception as e:
-                self.logger.error(f"URL extraction failed for {url}: {e}")
-
-        # Remove duplicates and filter valid URLs
-        unique_urls = list(set(paper_urls))
-        valid_urls = [url for url in unique_urls if self._is_valid_paper_url(url)]
+        # Deduplicate and filter valid URLs in a single pass, skipping any
+        # already returned this session or crawled in an earlier run
+        seen = self._seen_paper_urls
+        processed = self._processed_paper_urls
+        paper_urls: Set[str] = set()
+        for urls in url_lists:
+            paper_urls.update(
+                url
+                for url in urls
+                if url not in seen
+                and self._is_valid_paper_url(url)
+                and url not in processed
+            )
+        seen.update(paper_urls)
+        valid_urls = list(paper_urls)
 
         self.logger.info(
             f"Extracted {len(valid_urls)} paper URLs from {len(source_urls)} source pages"
@@ -248,57 +289,193 @@ class MCPEnhancedCrawlerAgent:
 
         return valid_urls
 
-    def _parse_web_content(self, content: str, source_url: str) -> Dict[str, Any]:
+    async def _call_tool(
+        self, server: str, tool_name: str, parameters: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Call an MCP tool while holding a slot in the server's concurrency limit."""
+        async with self._server_semaphores[server]:
+            return await mcp_manager.call_tool(server, tool_name, parameters)
+
+    async def _gather_per_url(
+        self,
+        urls: List[str],
+        worker: Callable[[str], Awaitable[Any]],
+        action: str,
+    ) -> Tuple[List[Any], List[str]]:
+        """
+        Run worker for every URL concurrently and split results from errors.
+
+        Each URL first takes its rate-limiter slot, then holds the concurrency
+        semaphore while the worker runs, so both limits apply.
+
+        Returns:
+            Tuple of (non-empty worker results, "url: error" messages)
+        """
+
+        async def run(url: str) -> Any:
+            await self.rate_limiter.wait()
+            async with self.concurrency:
+                return await worker(url)
+
+        outcomes = await asyncio.gather(
+            *(run(url) for url in urls), return_exceptions=True
+        )
+
+        results = []
+        errors = []
+        for url, outcome in zip(urls, outcomes):
+            if isinstance(outcome, Exception):
+                self.logger.error(f"{action} failed for {url}: {outcome}")
+                errors.append(f"{url}: {str(outcome)}")
+            elif outcome:
+                results.append(outcome)
+
+        return results, errors
+
+    async def _crawl_web_source(
+        self, url: str, crawled_at: str
+    ) -> Optional[Dict[str, Any]]:
+        """Navigate to a page with Playwright and parse its paper content."""
+        extract_response = await self._navigate_and_extract(
+            url, ["article", ".paper", ".publication"], wait_for="networkidle"
+        )
+
+        if extract_response and extract_response.get("content"):
+            return self._parse_web_content(extract_response["content"], url, crawled_at)
+        return None
+
+    async def _fetch_content_url(
+        self, url: str, crawled_at: str
+    ) -> Optional[Dict[str, Any]]:
+        """Fetch a URL as markdown with the Fetch MCP server and parse it."""
+        response = await self._call_tool(
+            "fetch", "fetch_content", {"url": url, "format": "markdown"}
+        )
+
+        if not response.get("content"):
+            return None
+
+        paper_data = self._parse_fetched_content(
+            response["content"], url, crawled_at
+        )
+        self._fetch_cache[url] = paper_data
+        if len(self._fetch_cache) > _FETCH_CACHE_SIZE:
+            self._fetch_cache.popitem(last=False)
+        return dict(paper_data)
+
+    async def _navigate_and_extract(
+        self, url: str, selectors: List[str], wait_for: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Load a page in Playwright and extract content matching the selectors.
+
+        Uses the server's combined navigate_and_extract tool when it is
+        advertised, saving a round-trip; otherwise navigates and extracts in
+        two calls.
+
+        Returns:
+            The extract_content response, or None if navigation failed
+        """
+        navigate_params = {"url": url}
+        if wait_for:
+            navigate_params["wait_for"] = wait_for
+
+        async with self._playwright_page_lock:
+            if "navigate_and_extract" in mcp_manager.get_available_tools("playwright"):
+                response = await self._call_tool(
+                    "playwright",
+                    "navigate_and_extract",
+                    {**navigate_params, "selectors": selectors},
+                )
+                return None if response.get("success") is False else response
+
+            nav_response = await self._call_tool("playwright", "navigate", navigate_params)
+            if not nav_response.get("success"):
+                return None
+
+            return await self._call_tool(
+                "playwright", "extract_content", {"selectors": selectors}
+            )
+
+    async def _extract_urls_from_source(self, url: str) -> List[str]:
+        """Collect candidate paper links from a single source page."""
+        if mcp_manager.is_server_connected("playwright"):
+            # Use Playwright for JavaScript-heavy pages
+            response = await self._navigate_and_extract(
+                url, ["a[href*='pdf']", "a[href*='paper']", "a[href*='arxiv']"]
+            )
+
+            return (response or {}).get("links") or []
+
+        if mcp_manager.is_server_connected("fetch"):
+            # Use Fetch MCP as fallback
+            response = await self._call_tool("fetch", "fetch_url", {"url": url})
+
+            # Basic URL extraction from content
+            content = response.get("content", "")
+            return self._extract_urls_from_content(content)
+
+        return []
+
+    def _parse_web_content(
+        self, content: str, source_url: str, crawled_at: str
+    ) -> Dict[str, Any]:
         """Parse web content into paper metadata."""
         # Basic parsing - this would be enhanced based on specific site structures
         return {
             "title": "Extracted from web",  # Would extract actual title
             "authors": [],  # Would extract actual authors
-            "abstract": content[:500] + "..." if len(content) > 500 else content,
+            "abstract": _abstract_preview(content),
             "source_url": source_url,
             "source": "web_crawler",
-            "date_crawled": datetime.utcnow().isoformat(),
+            "date_crawled": crawled_at,
             "content_preview": content[:1000],
         }
 
-    def _parse_fetched_content(self, content: str, source_url: str) -> Dict[str, Any]:
+    def _parse_fetched_content(
+        self, content: str, source_url: str, crawled_at: str
+    ) -> Dict[str, Any]:
         """Parse fetched markdown content into paper metadata."""
-        # Basic parsing for markdown content
-        lines = content.split("\n")
-        title = lines[0].replace("#", "").strip() if lines else "Fetched Content"
+        # Basic parsing for markdown content; only the first line is needed
+        title = content.partition("\n")[0].replace("#", "").strip()
 
         return {
             "title": title,
             "authors": [],  # Would extract from content
-            "abstract": content[:500] + "..." if len(content) > 500 else content,
+            "abstract": _abstract_preview(content),
             "source_url": source_url,
             "source": "fetch_crawler",
-            "date_crawled": datetime.utcnow().isoformat(),
+            "date_crawled": crawled_at,
             "markdown_content": content,
         }
 
     def _extract_urls_from_content(self, content: str) -> List[str]:
         """Extract URLs from HTML/text content."""
-        import re
-
-        # Basic URL extraction patterns
-        url_patterns = [
-            r'https?://arxiv\.org/[^\s<>"]+',
-            r'https?://[^\s<>"]*\.pdf[^\s<>"]*',
-            r'https?://[^\s<>"]*paper[^\s<>"]*',
-        ]
-
-        urls = []
-        for pattern in url_patterns:
-            urls.extend(re.findall(pattern, content))
-
-        return urls
+        return _PAPER_URL_RE.findall(content)
 
     def _is_valid_paper_url(self, url: str) -> bool:
         """Check if URL likely points to a paper."""
-        paper_indicators = ["arxiv.org", ".pdf", "paper", "publication", "doi.org"]
+        return _PAPER_URL_INDICATOR_RE.search(url) is not None
 
-        return any(indicator in url.lower() for indicator in paper_indicators)
+    async def _load_processed_paper_urls(self):
+        """Load the processed-URL filter saved by a previous run, if any."""
+        if not os.path.exists(self._processed_urls_path):
+            return
+        try:
+            self._processed_paper_urls = await asyncio.to_thread(
+                BloomFilter.load, self._processed_urls_path
+            )
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable processed-URL filter: {e}")
+
+    async def _save_processed_paper_urls(self):
+        """Persist the processed-URL filter for the next run."""
+        try:
+            await asyncio.to_thread(
+                self._processed_paper_urls.save, self._processed_urls_path
+            )
+        except OSError as e:
+            self.logger.error(f"Failed to save processed-URL filter: {e}")
 
     async def get_server_status(self) -> Dict[str, str]:
         """Get status of all MCP servers used by crawler."""
@@ -310,4 +487,5 @@ class MCPEnhancedCrawlerAgent:
     async def shutdown(self):
         """Clean shutdown of crawler agent."""
         self.logger.info("Shutting down Enhanced Crawler Agent")
+        await self._save_processed_paper_urls()
         # MCP manager handles server disconnection globally
@@ -5,19 +5,51 @@ Manages database connections for multiple agents in the arXiv scraper system,
 ensuring efficient resource usage and preventing connection exhaustion.
 """
 
+import asyncio
+import heapq
+import itertools
 import logging
 import threading
 import time
-from typing import Dict, Any, Optional, Set
-from dataclasses import dataclass
-from contextlib import contextmanager
-from pymongo import MongoClient
+from typing import Dict, Any, List, Optional, Set, Tuple
+from dataclasses import dataclass, field
+from contextlib import asynccontextmanager, contextmanager
+from pymongo import AsyncMongoClient, MongoClient
+from pymongo.asynchronous.database import AsyncDatabase
 from pymongo.database import Database
 from .mongodb_connector import MongoDBConnector
 from ..config.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Process-wide checkout IDs for log correlation; next() on a count is atomic in CPython
+_connection_ids = itertools.count(1)
+
+# Agent type configurations; "priority" is reported in stats but does not affect allocation
+AGENT_TYPE_CONFIGS: Dict[str, Dict[str, int]] = {
+    "crawler": {"max_connections": 8, "priority": 2},
+    "scraper": {"max_connections": 10, "priority": 3},
+    "downloader": {"max_connections": 5, "priority": 2},
+    "database": {"max_connections": 3, "priority": 4},
+    "nlp": {"max_connections": 4, "priority": 1},
+    "monitoring": {"max_connections": 2, "priority": 1},
+    "testing": {"max_connections": 2, "priority": 1},
+    "orchestrator": {"max_connections": 3, "priority": 4},
+}
+
+
+def _connector_kwargs(settings) -> Dict[str, Any]:
+    """MongoDBConnector arguments shared by every pool, resolved from settings once."""
+    database = settings.database
+    return {
+        "host": database.host,
+        "port": database.port,
+        "database_name": database.database_name,
+        "username": database.username,
+        "password": database.password,
+        "timeout_ms": database.timeout_ms,
+    }
+
 
 @dataclass
 class AgentConnectionInfo:
@@ -27,7 +59,23 @@ class AgentConnectionInfo:
     connection_count: int = 0
     last_activity: float = 0
     max_connections: int = 5
-    priority: int = 1  # Higher priority gets preference during resource contention
+    priority: int = 1  # Informational only; reported in stats, not used for allocation
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+    pool: Optional["AgentTypePool"] = field(default=None, repr=False, compare=False)
+    # Whether an entry for this agent is pending in the expiry heap
+    expiry_scheduled: bool = field(default=False, repr=False, compare=False)
+
+
+@dataclass
+class AgentTypePool:
+    """Long-lived MongoClient shared by every agent of one type; PyMongo pools the sockets."""
+    agent_type: str
+    max_pool_size: int
+    conn_kwargs: Dict[str, Any] = field(default_factory=dict, repr=False)
+    agent_count: int = 0
+    client: Optional[MongoClient] = field(default=None, repr=False)
+    database: Optional[Database] = field(default=None, repr=False)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
 
 
 class AgentPoolManager:
@@ -35,8 +83,7 @@ class AgentPoolManager:
     Connection pool manager optimized for multi-agent access patterns.
     
     Manages database connections across different agent types with:
-    - Per-agent connection limits
-    - Priority-based resource allocation
+    - Per-agent connection limits, failing fast at capacity
     - Connection health monitoring
     - Automatic cleanup of idle connections
     """
@@ -50,35 +97,34 @@ class AgentPoolManager:
         
         Args:
             total_max_connections: Maximum total connections across all agents
-            cleanup_interval_seconds: How often to clean up idle connections
+            cleanup_interval_seconds: Kept for compatibility; cleanup now wakes
+                at each agent's idle deadline instead of polling
             connection_timeout_seconds: How long before idle connections are closed
         """
         self.settings = get_settings()
         self.total_max_connections = total_max_connections
         self.cleanup_interval = cleanup_interval_seconds
         self.connection_timeout = connection_timeout_seconds
+        self._connector_kwargs = _connector_kwargs(self.settings)
         
-        # Thread-safe data structures
+        # Thread-safe data structures: _lock guards the agent registry, the type
+        # pools and the global counter; each agent's own lock guards its checkout
+        # count, and each type pool's lock guards its client
         self._lock = threading.RLock()
         self._agents: Dict[str, AgentConnectionInfo] = {}
-        self._connections: Dict[str, Dict[str, MongoClient]] = {}
+        self._type_pools: Dict[str, AgentTypePool] = {}
         self._active_connections = 0
+        # (deadline, agent_id) min-heap with at most one entry per agent; deadlines
+        # only move later, so an entry is re-checked and re-pushed when it fires
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._expiry_condition = threading.Condition(self._lock)
         
         # Background cleanup thread
         self._cleanup_thread = None
         self._shutdown = False
         
         # Agent type configurations
-        self._agent_configs = {
-            "crawler": {"max_connections": 8, "priority": 2},
-            "scraper": {"max_connections": 10, "priority": 3},
-            "downloader": {"max_connections": 5, "priority": 2},
-            "database": {"max_connections": 3, "priority": 4},
-            "nlp": {"max_connections": 4, "priority": 1},
-            "monitoring": {"max_connections": 2, "priority": 1},
-            "testing": {"max_connections": 2, "priority": 1},
-            "orchestrator": {"max_connections": 3, "priority": 4},
-        }
+        self._agent_configs = dict(AGENT_TYPE_CONFIGS)
         
         self._start_cleanup_thread()
     
@@ -89,42 +135,85 @@ class AgentPoolManager:
             self._cleanup_thread.start()
     
     def _cleanup_worker(self):
-        """Background worker to clean up idle connections."""
-        while not self._shutdown:
-            try:
-                time.sleep(self.cleanup_interval)
-                self._cleanup_idle_connections()
-            except Exception as e:
-                logger.error(f"Error in cleanup worker: {e}")
+        """Background worker that sleeps until the next idle deadline."""
+        with self._expiry_condition:
+            while not self._shutdown:
+                try:
+                    if not self._expiry_heap:
+                        self._expiry_condition.wait()
+                        continue
+                    
+                    deadline, agent_id = self._expiry_heap[0]
+                    current_time = time.time()
+                    if deadline > current_time:
+                        self._expiry_condition.wait(timeout=deadline - current_time)
+                        continue
+                    
+                    heapq.heappop(self._expiry_heap)
+                    self._expire_agent(agent_id, current_time)
+                except Exception as e:
+                    logger.error(f"Error in cleanup worker: {e}")
     
-    def _cleanup_idle_connections(self):
-        """Clean up idle connections that have exceeded timeout."""
-        current_time = time.time()
+    def _schedule_expiry(self, agent_info: AgentConnectionInfo):
+        """Push the agent's idle deadline unless one is already pending (caller holds _lock)."""
+        if agent_info.expiry_scheduled:
+            return
         
-        with self._lock:
-            for agent_id in list(self._agents.keys()):
-                agent_info = self._agents[agent_id]
-                
-                # Check if agent has been idle too long
-                if current_time - agent_info.last_activity > self.connection_timeout:
-                    logger.info(f"Cleaning up idle connections for agent {agent_id}")
-                    self._close_agent_connections(agent_id)
+        agent_info.expiry_scheduled = True
+        deadline = agent_info.last_activity + self.connection_timeout
+        heapq.heappush(self._expiry_heap, (deadline, agent_info.agent_id))
+        if self._expiry_heap[0][1] == agent_info.agent_id:
+            # New earliest deadline; wake the cleanup thread to re-arm its timer
+            self._expiry_condition.notify()
     
-    def _close_agent_connections(self, agent_id: str):
-        """Close all connections for a specific agent."""
-        if agent_id in self._connections:
-            for conn_id, client in self._connections[agent_id].items():
-                try:
-                    client.close()
-                    self._active_connections -= 1
-                    logger.debug(f"Closed connection {conn_id} for agent {agent_id}")
-                except Exception as e:
-                    logger.error(f"Error closing connection for agent {agent_id}: {e}")
-            
-            del self._connections[agent_id]
+    def _expire_agent(self, agent_id: str, current_time: float):
+        """Close an agent's connections if it is still idle (caller holds _lock)."""
+        agent_info = self._agents.get(agent_id)
+        if agent_info is None:
+            return
         
-        if agent_id in self._agents:
+        agent_info.expiry_scheduled = False
+        with agent_info.lock:
+            if agent_info.connection_count:
+                # Checked out; the release reschedules the deadline
+                return
+            if agent_info.last_activity + self.connection_timeout > current_time:
+                # Stale entry: the agent was used since it was pushed
+                self._schedule_expiry(agent_info)
+                return
             del self._agents[agent_id]
+        
+        logger.info(f"Cleaning up idle connections for agent {agent_id}")
+        self._release_type_pool(agent_info)
+    
+    def _close_agent_connections(self, agent_id: str):
+        """Unregister an agent and release its share of the type pool (caller holds _lock)."""
+        agent_info = self._agents.pop(agent_id, None)
+        if agent_info is not None:
+            self._release_type_pool(agent_info)
+    
+    def _release_type_pool(self, agent_info: AgentConnectionInfo):
+        """Drop an unregistered agent from its type pool, closing the client once unused (caller holds _lock)."""
+        pool = agent_info.pool
+        if pool is None:
+            return
+        
+        pool.agent_count -= 1
+        if pool.agent_count > 0:
+            return
+        
+        del self._type_pools[pool.agent_type]
+        with pool.lock:
+            client = pool.client
+            pool.client = None
+            pool.database = None
+        
+        if client is not None:
+            try:
+                client.close()
+                logger.debug(f"Closed client for agent type {pool.agent_type}")
+            except Exception as e:
+                logger.error(f"Error closing connection for agent type {pool.agent_type}: {e}")
     
     def register_agent(self, 
                       agent_id: str, 
@@ -138,7 +227,7 @@ class AgentPoolManager:
             agent_id: Unique identifier for the agent
             agent_type: Type of agent (crawler, scraper, etc.)
             max_connections: Maximum connections for this agent
-            priority: Priority level (higher = more important)
+            priority: Priority level, recorded for stats only; allocation ignores it
             
         Returns:
             True if registration successful, False otherwise
@@ -162,8 +251,24 @@ class AgentPoolManager:
                     last_activity=time.time()
                 )
                 
+                pool = self._type_pools.get(agent_type)
+                if pool is None:
+                    max_pool_size = type_config.get("max_connections", max_conn)
+                    pool = AgentTypePool(
+                        agent_type=agent_type,
+                        max_pool_size=max_pool_size,
+                        conn_kwargs={
+                            **self._connector_kwargs,
+                            "max_pool_size": max_pool_size,
+                            "min_pool_size": 1,
+                        }
+                    )
+                    self._type_pools[agent_type] = pool
+                pool.agent_count += 1
+                agent_info.pool = pool
+                
                 self._agents[agent_id] = agent_info
-                self._connections[agent_id] = {}
+                self._schedule_expiry(agent_info)
                 
                 logger.info(f"Registered agent {agent_id} ({agent_type}) with {max_conn} max connections")
                 return True
@@ -172,100 +277,59 @@ class AgentPoolManager:
             logger.error(f"Failed to register agent {agent_id}: {e}")
             return False
     
-    def _can_create_connection(self, agent_id: str) -> bool:
-        """Check if an agent can create a new connection."""
-        agent_info = self._agents.get(agent_id)
-        if not agent_info:
-            return False
-        
-        # Check agent-specific limits
-        if agent_info.connection_count >= agent_info.max_connections:
-            return False
-        
-        # Check global limits
-        if self._active_connections >= self.total_max_connections:
-            # Try to free up connections from lower priority agents
-            return self._try_free_connections_for_agent(agent_id)
-        
-        return True
-    
-    def _try_free_connections_for_agent(self, requesting_agent_id: str) -> bool:
-        """Try to free connections from lower priority agents."""
-        requesting_agent = self._agents.get(requesting_agent_id)
-        if not requesting_agent:
-            return False
-        
-        # Find agents with lower priority and idle connections
-        candidates = []
-        for agent_id, agent_info in self._agents.items():
-            if (agent_id != requesting_agent_id and 
-                agent_info.priority < requesting_agent.priority and
-                agent_info.connection_count > 1):  # Keep at least one connection
-                candidates.append((agent_id, agent_info))
-        
-        # Sort by priority (lowest first) and last activity (oldest first)
-        candidates.sort(key=lambda x: (x[1].priority, x[1].last_activity))
-        
-        # Close one connection from the lowest priority agent
-        if candidates:
-            agent_id, _ = candidates[0]
-            connections = self._connections.get(agent_id, {})
-            if connections:
-                # Close the first connection
-                conn_id = next(iter(connections))
-                client = connections[conn_id]
-                try:
-                    client.close()
-                    del connections[conn_id]
-                    self._agents[agent_id].connection_count -= 1
-                    self._active_connections -= 1
-                    logger.info(f"Freed connection from agent {agent_id} for {requesting_agent_id}")
-                    return True
-                except Exception as e:
-                    logger.error(f"Error freeing connection: {e}")
-        
-        return False
+    def _get_pool_database(self, pool: AgentTypePool) -> Database:
+        """Return the type pool's database handle, connecting its client on first use."""
+        with pool.lock:
+            if pool.database is None:
+                connector = MongoDBConnector(**pool.conn_kwargs)
+                pool.database = connector.connect()
+                pool.client = connector._client
+                logger.debug(f"Created shared client for agent type {pool.agent_type}")
+            
+            return pool.database
     
     @contextmanager
     def get_connection(self, agent_id: str):
         """
         Context manager to get a database connection for an agent.
         
+        Connections are checked out of the MongoClient shared by the agent's
+        type, so no handshake happens per call once that client is connected.
+        
         Args:
             agent_id: Agent identifier
             
         Yields:
             Database instance
         """
-        if agent_id not in self._agents:
+        agent_info = self._agents.get(agent_id)
+        if agent_info is None:
             raise ValueError(f"Agent {agent_id} not registered")
         
-        connection_id = f"{agent_id}_{threading.current_thread().ident}_{time.time()}"
-        client = None
+        connection_id = next(_connection_ids)
+        agent_reserved = False
+        global_reserved = False
         
         try:
+            # Check agent-specific limits under the agent's own lock
+            with agent_info.lock:
+                if self._agents.get(agent_id) is not agent_info:
+                    raise ValueError(f"Agent {agent_id} not registered")
+                if agent_info.connection_count >= agent_info.max_connections:
+                    raise RuntimeError(f"Cannot create connection for agent {agent_id}")
+                agent_info.connection_count += 1
+                agent_info.last_activity = time.time()
+            agent_reserved = True
+            
+            # Check global limits; only this short section is globally serialized
             with self._lock:
-                if not self._can_create_connection(agent_id):
+                if self._active_connections >= self.total_max_connections:
                     raise RuntimeError(f"Cannot create connection for agent {agent_id}")
-                
-                # Create new connection
-                connector = MongoDBConnector(
-                    username=self.settings.database.username,
-                    password=self.settings.database.password,
-                    max_pool_size=5,  # Smaller pool per connection
-                    min_pool_size=1
-                )
-                
-                database = connector.connect()
-                client = connector._client
-                
-                # Track the connection
-                self._connections[agent_id][connection_id] = client
-                self._agents[agent_id].connection_count += 1
-                self._agents[agent_id].last_activity = time.time()
                 self._active_connections += 1
-                
-                logger.debug(f"Created connection {connection_id} for agent {agent_id}")
+            global_reserved = True
+            
+            database = self._get_pool_database(agent_info.pool)
+            logger.debug(f"Checked out connection {connection_id} for agent {agent_id}")
             
             # Yield the database to the agent
             yield database
@@ -275,19 +339,17 @@ class AgentPoolManager:
             raise
         
         finally:
-            # Clean up the connection
-            if client:
-                try:
-                    with self._lock:
-                        if (agent_id in self._connections and 
-                            connection_id in self._connections[agent_id]):
-                            client.close()
-                            del self._connections[agent_id][connection_id]
-                            self._agents[agent_id].connection_count -= 1
-                            self._active_connections -= 1
-                            logger.debug(f"Closed connection {connection_id} for agent {agent_id}")
-                except Exception as e:
-                    logger.error(f"Error cleaning up connection: {e}")
+            # Return the checkout; the shared client stays open for reuse
+            if agent_reserved:
+                with agent_info.lock:
+                    agent_info.connection_count -= 1
+                    agent_info.last_activity = time.time()
+                with self._lock:
+                    if global_reserved:
+                        self._active_connections -= 1
+                    if self._agents.get(agent_id) is agent_info:
+                        self._schedule_expiry(agent_info)
+                logger.debug(f"Released connection {connection_id} for agent {agent_id}")
     
     def get_pool_status(self) -> Dict[str, Any]:
         """Get current status of the connection pool."""
@@ -307,6 +369,7 @@ class AgentPoolManager:
                 "total_connections": self._active_connections,
                 "max_connections": self.total_max_connections,
                 "registered_agents": len(self._agents),
+                "type_pools": len(self._type_pools),
                 "agents": agent_status
             }
     
@@ -321,8 +384,10 @@ class AgentPoolManager:
                 self._close_agent_connections(agent_id)
             
             self._agents.clear()
-            self._connections.clear()
+            self._type_pools.clear()
+            self._expiry_heap.clear()
             self._active_connections = 0
+            self._expiry_condition.notify_all()
         
         # Wait for cleanup thread to finish
         if self._cleanup_thread and self._cleanup_thread.is_alive():
@@ -331,8 +396,179 @@ class AgentPoolManager:
         logger.info("Agent pool manager shutdown complete")
 
 
-# Global pool manager instance
+class AsyncAgentPoolManager:
+    """
+    asyncio-native counterpart of AgentPoolManager for async agents.
+    
+    Uses an asyncio.Lock and PyMongo's native async client, so checking out a
+    connection never blocks the event loop. As in AgentPoolManager, agents of
+    one type share a single AsyncMongoClient and checkouts only count against
+    the limits.
+    """
+    
+    def __init__(self, total_max_connections: int = 50):
+        """
+        Initialize the async agent pool manager.
+        
+        Args:
+            total_max_connections: Maximum total connections across all agents
+        """
+        self.settings = get_settings()
+        self.total_max_connections = total_max_connections
+        self._connector_kwargs = _connector_kwargs(self.settings)
+        
+        # Counters are only touched between awaits; _lock serializes registration
+        # and the first connect of each type's client
+        self._lock = asyncio.Lock()
+        self._agents: Dict[str, AgentConnectionInfo] = {}
+        self._clients: Dict[str, AsyncMongoClient] = {}
+        self._databases: Dict[str, AsyncDatabase] = {}
+        self._active_connections = 0
+        self._agent_configs = dict(AGENT_TYPE_CONFIGS)
+    
+    async def register_agent(self,
+                             agent_id: str,
+                             agent_type: str,
+                             max_connections: Optional[int] = None,
+                             priority: Optional[int] = None) -> bool:
+        """
+        Register an agent with the pool manager.
+        
+        Args:
+            agent_id: Unique identifier for the agent
+            agent_type: Type of agent (crawler, scraper, etc.)
+            max_connections: Maximum connections for this agent
+            priority: Priority level, recorded for stats only; allocation ignores it
+            
+        Returns:
+            True if registration successful, False otherwise
+        """
+        async with self._lock:
+            if agent_id in self._agents:
+                logger.warning(f"Agent {agent_id} already registered")
+                return False
+            
+            type_config = self._agent_configs.get(agent_type, {})
+            max_conn = max_connections or type_config.get("max_connections", 3)
+            
+            self._agents[agent_id] = AgentConnectionInfo(
+                agent_id=agent_id,
+                agent_type=agent_type,
+                max_connections=max_conn,
+                priority=priority or type_config.get("priority", 1),
+                last_activity=time.time()
+            )
+            
+            logger.info(f"Registered async agent {agent_id} ({agent_type}) with {max_conn} max connections")
+            return True
+    
+    async def _get_type_database(self, agent_type: str) -> AsyncDatabase:
+        """Return the type's database handle, connecting its client on first use."""
+        database = self._databases.get(agent_type)
+        if database is not None:
+            return database
+        
+        async with self._lock:
+            database = self._databases.get(agent_type)
+            if database is None:
+                type_config = self._agent_configs.get(agent_type, {})
+                connector = MongoDBConnector(
+                    **self._connector_kwargs,
+                    max_pool_size=type_config.get("max_connections", 3),
+                    min_pool_size=1
+                )
+                client = connector.get_async_client()
+                try:
+                    await client.admin.command("ping")
+                except Exception:
+                    await client.close()
+                    raise
+                
+                database = client[connector.database_name]
+                self._clients[agent_type] = client
+                self._databases[agent_type] = database
+                logger.debug(f"Created shared async client for agent type {agent_type}")
+            
+            return database
+    
+    @asynccontextmanager
+    async def get_connection(self, agent_id: str):
+        """
+        Async context manager to get a database connection for an agent.
+        
+        Args:
+            agent_id: Agent identifier
+            
+        Yields:
+            AsyncDatabase instance
+        """
+        agent_info = self._agents.get(agent_id)
+        if agent_info is None:
+            raise ValueError(f"Agent {agent_id} not registered")
+        
+        # No await between the checks and the increments, so no lock is needed
+        if (agent_info.connection_count >= agent_info.max_connections
+                or self._active_connections >= self.total_max_connections):
+            raise RuntimeError(f"Cannot create connection for agent {agent_id}")
+        agent_info.connection_count += 1
+        agent_info.last_activity = time.time()
+        self._active_connections += 1
+        
+        try:
+            yield await self._get_type_database(agent_info.agent_type)
+            
+        except Exception as e:
+            logger.error(f"Error getting connection for agent {agent_id}: {e}")
+            raise
+        
+        finally:
+            agent_info.connection_count -= 1
+            agent_info.last_activity = time.time()
+            self._active_connections -= 1
+    
+    def get_pool_status(self) -> Dict[str, Any]:
+        """Get current status of the connection pool."""
+        current_time = time.time()
+        return {
+            "total_connections": self._active_connections,
+            "max_connections": self.total_max_connections,
+            "registered_agents": len(self._agents),
+            "type_pools": len(self._clients),
+            "agents": {
+                agent_id: {
+                    "type": agent_info.agent_type,
+                    "connections": agent_info.connection_count,
+                    "max_connections": agent_info.max_connections,
+                    "priority": agent_info.priority,
+                    "last_activity": agent_info.last_activity,
+                    "idle_time": current_time - agent_info.last_activity
+                }
+                for agent_id, agent_info in self._agents.items()
+            }
+        }
+    
+    async def shutdown(self):
+        """Shutdown the pool manager and close all clients."""
+        logger.info("Shutting down async agent pool manager")
+        
+        async with self._lock:
+            for agent_type, client in self._clients.items():
+                try:
+                    await client.close()
+                except Exception as e:
+                    logger.error(f"Error closing connection for agent type {agent_type}: {e}")
+            
+            self._clients.clear()
+            self._databases.clear()
+            self._agents.clear()
+            self._active_connections = 0
+        
+        logger.info("Async agent pool manager shutdown complete")
+
+
+# Global pool manager instances
 _pool_manager: Optional[AgentPoolManager] = None
+_async_pool_manager: Optional[AsyncAgentPoolManager] = None
 
 
 def get_agent_pool_manager() -> AgentPoolManager:
@@ -363,4 +599,35 @@ def shutdown_pool_manager():
     global _pool_manager
     if _pool_manager:
         _pool_manager.shutdown()
-        _pool_manager = None
\ No newline at end of file
+        _pool_manager = None
+
+
+def get_async_agent_pool_manager() -> AsyncAgentPoolManager:
+    """Get the global async agent pool manager instance."""
+    global _async_pool_manager
+    if _async_pool_manager is None:
+        settings = get_settings()
+        _async_pool_manager = AsyncAgentPoolManager(
+            total_max_connections=settings.database.max_pool_size
+        )
+    return _async_pool_manager
+
+
+async def register_async_agent(agent_id: str, agent_type: str) -> bool:
+    """Register an agent with the async pool manager."""
+    return await get_async_agent_pool_manager().register_agent(agent_id, agent_type)
+
+
+@asynccontextmanager
+async def get_async_agent_connection(agent_id: str):
+    """Get an async database connection for an agent."""
+    async with get_async_agent_pool_manager().get_connection(agent_id) as db:
+        yield db
+
+
+async def shutdown_async_pool_manager():
+    """Shutdown the global async pool manager."""
+    global _async_pool_manager
+    if _async_pool_manager:
+        await _async_pool_manager.shutdown()
+        _async_pool_manager = None
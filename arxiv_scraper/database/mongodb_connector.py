@@ -7,14 +7,14 @@ optimized for academic paper metadata storage.
 
 import logging
 from typing import Optional, Dict, Any, List
-from pymongo import MongoClient, IndexModel
+from pymongo import AsyncMongoClient, MongoClient, IndexModel
 from pymongo.database import Database
 from pymongo.collection import Collection
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
 import os
+import threading
 from urllib.parse import quote_plus
 import asyncio
-from motor.motor_asyncio import AsyncIOMotorClient
 
 logger = logging.getLogger(__name__)
 
@@ -28,9 +28,11 @@ class MongoDBConnector:
                  database_name: str = "arxiv_scraper",
                  username: Optional[str] = None,
                  password: Optional[str] = None,
-                 max_pool_size: int = 50,
+                 max_pool_size: int = 200,
                  min_pool_size: int = 10,
-                 timeout_ms: int = 30000):
+                 max_idle_time_ms: int = 300000,
+                 timeout_ms: int = 30000,
+                 compressors: str = "zstd,snappy,zlib"):
         """
         Initialize MongoDB connector.
         
@@ -42,7 +44,9 @@ class MongoDBConnector:
             password: MongoDB password (optional)
             max_pool_size: Maximum connection pool size
             min_pool_size: Minimum connection pool size
+            max_idle_time_ms: Idle time after which a pooled connection is closed
             timeout_ms: Connection timeout in milliseconds
+            compressors: Wire compressors to offer, in order of preference
         """
         self.host = host
         self.port = port
@@ -51,11 +55,17 @@ class MongoDBConnector:
         self.password = password
         self.max_pool_size = max_pool_size
         self.min_pool_size = min_pool_size
+        self.max_idle_time_ms = max_idle_time_ms
         self.timeout_ms = timeout_ms
+        self.compressors = compressors
         
         self._client: Optional[MongoClient] = None
         self._database: Optional[Database] = None
-        self._async_client: Optional[AsyncIOMotorClient] = None
+        # AsyncMongoClient is bound to one event loop, so each loop gets its own.
+        # A client holds its loop, so weak keys would never expire; entries for
+        # closed loops are pruned instead
+        self._async_clients: Dict[asyncio.AbstractEventLoop, AsyncMongoClient] = {}
+        self._lock = threading.Lock()
         
     def _build_connection_string(self) -> str:
         """Build MongoDB connection string."""
@@ -68,10 +78,19 @@ class MongoDBConnector:
             f"mongodb://{auth_string}{self.host}:{self.port}/{self.database_name}"
             f"?maxPoolSize={self.max_pool_size}"
             f"&minPoolSize={self.min_pool_size}"
+            f"&maxIdleTimeMS={self.max_idle_time_ms}"
+            f"&waitQueueTimeoutMS=10000"
+            f"&compressors={self.compressors}"
+            f"&zlibCompressionLevel=6"
             f"&serverSelectionTimeoutMS={self.timeout_ms}"
             f"&retryWrites=true"
             f"&w=majority"
+            f"&appName=arxiv_scraper"
+            f"&heartbeatFrequencyMS=30000"
         )
+        if self.host in ("localhost", "127.0.0.1"):
+            # Single local node; skip replica set discovery
+            connection_string += "&directConnection=true"
         return connection_string
     
     def connect(self) -> Database:
@@ -84,7 +103,12 @@ class MongoDBConnector:
         Raises:
             ConnectionFailure: If unable to connect to MongoDB
         """
-        if self._client is None:
+        if self._database is not None:
+            return self._database
+        
+        with self._lock:
+            if self._database is not None:
+                return self._database
             try:
                 connection_string = self._build_connection_string()
                 self._client = MongoClient(connection_string)
@@ -98,22 +122,38 @@ class MongoDBConnector:
                 
             except (ConnectionFailure, ServerSelectionTimeoutError) as e:
                 logger.error(f"Failed to connect to MongoDB: {e}")
+                self._client.close()
+                self._client = None
                 raise ConnectionFailure(f"Cannot connect to MongoDB at {self.host}:{self.port}")
         
         return self._database
     
-    def get_async_client(self) -> AsyncIOMotorClient:
+    def get_async_client(self) -> AsyncMongoClient:
         """
-        Get async MongoDB client for concurrent operations.
+        Get the async MongoDB client for the running event loop.
+        
+        Must be called from a coroutine. Each event loop gets its own client,
+        which must be closed on that loop with aclose().
         
         Returns:
-            AsyncIOMotorClient instance
+            AsyncMongoClient instance
         """
-        if self._async_client is None:
-            connection_string = self._build_connection_string()
-            self._async_client = AsyncIOMotorClient(connection_string)
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            with self._lock:
+                self._prune_closed_loops()
+                client = self._async_clients.get(loop)
+                if client is None:
+                    client = AsyncMongoClient(self._build_connection_string())
+                    self._async_clients[loop] = client
             
-        return self._async_client
+        return client
+    
+    def _prune_closed_loops(self):
+        """Drop async clients whose event loop is closed; they can no longer be used."""
+        for loop in [loop for loop in self._async_clients if loop.is_closed()]:
+            del self._async_clients[loop]
     
     def get_collection(self, collection_name: str) -> Collection:
         """
@@ -201,20 +241,32 @@ class MongoDBConnector:
         return self._database.command("dbStats")
     
     def close(self):
-        """Close MongoDB connections."""
+        """Close the synchronous MongoDB connection; use aclose() for the async client."""
         if self._client:
             self._client.close()
             self._client = None
             self._database = None
             logger.info("MongoDB connection closed")
             
-        if self._async_client:
-            self._async_client.close()
-            self._async_client = None
+        with self._lock:
+            self._prune_closed_loops()
+        if self._async_clients:
+            logger.warning("Async MongoDB client left open; close it with aclose() on its event loop")
+    
+    async def aclose(self):
+        """Close the running event loop's async client, then the sync client."""
+        with self._lock:
+            client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client:
+            await client.close()
+            logger.info("Async MongoDB connection closed")
+        
+        self.close()
 
 
 # Global connector instance
 _connector: Optional[MongoDBConnector] = None
+_connector_lock = threading.Lock()
 
 
 def get_connector(username: Optional[str] = None, password: Optional[str] = None) -> MongoDBConnector:
@@ -231,21 +283,24 @@ def get_connector(username: Optional[str] = None, password: Optional[str] = None
     global _connector
     
     if _connector is None:
-        # Try to get credentials from environment variables
-        env_username = os.getenv('MONGODB_USERNAME', username)
-        env_password = os.getenv('MONGODB_PASSWORD', password)
-        
-        _connector = MongoDBConnector(
-            username=env_username,
-            password=env_password
-        )
+        with _connector_lock:
+            if _connector is None:
+                # Try to get credentials from environment variables
+                env_username = os.getenv('MONGODB_USERNAME', username)
+                env_password = os.getenv('MONGODB_PASSWORD', password)
+                
+                _connector = MongoDBConnector(
+                    username=env_username,
+                    password=env_password
+                )
     
     return _connector
 
 
-def close_global_connector():
-    """Close the global connector."""
+async def close_global_connector():
+    """Close the global connector, including the running event loop's async client."""
     global _connector
-    if _connector:
-        _connector.close()
-        _connector = None
\ No newline at end of file
+    with _connector_lock:
+        connector, _connector = _connector, None
+    if connector:
+        await connector.aclose()
\ No newline at end of file
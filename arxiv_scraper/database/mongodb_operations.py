@@ -5,106 +5,152 @@ Defines database schemas and operations for storing academic paper metadata
 from multiple sources (arXiv, Project Gutenberg, journals, etc.).
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional, Union
-from datetime import datetime
-from pymongo import IndexModel, ASCENDING, DESCENDING, TEXT
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple, Union
+from datetime import datetime, timezone
+from pymongo import IndexModel, UpdateOne, ASCENDING, DESCENDING, TEXT
 from pymongo.collection import Collection
-from pymongo.errors import DuplicateKeyError, BulkWriteError
+from pymongo.cursor import Cursor
+from pymongo.errors import DuplicateKeyError, BulkWriteError, OperationFailure
 from .mongodb_connector import MongoDBConnector, get_connector
 
 logger = logging.getLogger(__name__)
 
+_UTC = timezone.utc
 
-class SchemaDefinitions:
-    """Database schema definitions for different content types."""
+# Server error codes for an existing index redefined under the same name
+_INDEX_CONFLICT_CODES = (85, 86)
+
+# Server error code for dropping an index that does not exist
+_INDEX_NOT_FOUND_CODE = 27
+
+# Single-field paper indexes superseded by the compound indexes; dropped from
+# existing deployments so inserts stop paying for their B-tree writes
+_RETIRED_PAPER_INDEXES = ("authors_1", "created_at_-1", "source_1", "pdf_downloaded_1", "categories_1")
+
+# Fields returned by find_papers unless the caller asks for others
+PAPER_LIST_PROJECTION = {
+    "paper_id": 1,
+    "title": 1,
+    "authors": 1,
+    "categories": 1,
+    "date_published": 1,
+    "pdf_url": 1,
+    "pdf_downloaded": 1,
+    "processing_status": 1,
+}
+
+# Search results keep the abstract but skip the bulky source metadata
+SEARCH_RESULT_PROJECTION = {"source_metadata": 0}
+
+
+def _search_projection(projection: Dict[str, Any]) -> Dict[str, Any]:
+    """Make sure an inclusion projection keeps the search score and collection name."""
+    if any(value for key, value in projection.items() if key != "_id"):
+        return {**projection, "score": 1, "_collection": 1}
+    return projection
+
+
+def _text_filter(search_term: str, published_after: Optional[datetime]) -> Dict[str, Any]:
+    """Build a $text query, optionally restricted to recent documents."""
+    text_filter: Dict[str, Any] = {"$text": {"$search": search_term}}
+    if published_after is not None:
+        text_filter["date_published"] = {"$gte": published_after}
+    return text_filter
+
+
+def _to_bson(document) -> Dict[str, Any]:
+    """Convert a slotted document dataclass to a dict, omitting unset fields."""
+    bson = {}
+    for name in document.__slots__:
+        value = getattr(document, name)
+        if value is not None:
+            bson[name] = value
+    return bson
+
+
+@dataclass(slots=True)
+class Paper:
+    """Academic paper document (arXiv, journals, etc.)."""
+    paper_id: str  # Unique identifier (arXiv ID, DOI, etc.)
+    source: str  # Source type: "arxiv", "journal", "preprint"
+    title: str  # Paper title
+    authors: List[str] = field(default_factory=list)  # List of author names
+    abstract: str = ""  # Paper abstract
+    categories: List[str] = field(default_factory=list)  # Subject categories
+    date_published: Optional[datetime] = None  # Publication date
+    date_updated: Optional[datetime] = None  # Last update date
+    pdf_url: Optional[str] = None  # URL to PDF file
+    pdf_downloaded: bool = False  # Whether PDF has been downloaded
+    pdf_file_path: Optional[str] = None  # Local path to downloaded PDF
+    pdf_file_size: Optional[int] = None  # PDF file size in bytes
+    source_metadata: Dict[str, Any] = field(default_factory=dict)  # Source-specific metadata
+    processing_status: str = "pending"  # Status: "pending", "processed", "error"
+    created_at: Optional[datetime] = None  # Record creation time
+    updated_at: Optional[datetime] = None  # Record update time
     
-    @staticmethod
-    def get_paper_schema() -> Dict[str, Any]:
-        """
-        Schema for academic papers (arXiv, journals, etc.).
-        
-        Returns:
-            Dictionary defining paper document structure
-        """
-        return {
-            "paper_id": str,  # Unique identifier (arXiv ID, DOI, etc.)
-            "source": str,    # Source type: "arxiv", "journal", "preprint"
-            "title": str,     # Paper title
-            "authors": List[str],  # List of author names
-            "abstract": str,  # Paper abstract
-            "categories": List[str],  # Subject categories
-            "date_published": datetime,  # Publication date
-            "date_updated": Optional[datetime],  # Last update date
-            "pdf_url": str,   # URL to PDF file
-            "pdf_downloaded": bool,  # Whether PDF has been downloaded
-            "pdf_file_path": Optional[str],  # Local path to downloaded PDF
-            "pdf_file_size": Optional[int],  # PDF file size in bytes
-            "source_metadata": Dict[str, Any],  # Source-specific metadata
-            "processing_status": str,  # Status: "pending", "processed", "error"
-            "created_at": datetime,  # Record creation time
-            "updated_at": datetime,  # Record update time
-        }
+    def to_bson(self) -> Dict[str, Any]:
+        """Convert to a MongoDB document."""
+        return _to_bson(self)
+
+
+@dataclass(slots=True)
+class Book:
+    """Book document (Project Gutenberg, etc.)."""
+    book_id: str  # Unique identifier (Gutenberg ID, ISBN, etc.)
+    source: str  # Source type: "gutenberg", "archive_org"
+    title: str  # Book title
+    authors: List[str] = field(default_factory=list)  # List of author names
+    abstract: Optional[str] = None  # Book description/summary
+    subjects: List[str] = field(default_factory=list)  # Book subjects/categories
+    language: Optional[str] = None  # Book language
+    date_published: Optional[datetime] = None  # Original publication date
+    formats: List[Dict[str, str]] = field(default_factory=list)  # Available formats and URLs
+    pdf_url: Optional[str] = None  # URL to PDF file
+    pdf_downloaded: bool = False  # Whether PDF has been downloaded
+    pdf_file_path: Optional[str] = None  # Local path to downloaded PDF
+    pdf_file_size: Optional[int] = None  # PDF file size in bytes
+    source_metadata: Dict[str, Any] = field(default_factory=dict)  # Source-specific metadata
+    processing_status: str = "pending"  # Status: "pending", "processed", "error"
+    created_at: Optional[datetime] = None  # Record creation time
+    updated_at: Optional[datetime] = None  # Record update time
     
-    @staticmethod
-    def get_book_schema() -> Dict[str, Any]:
-        """
-        Schema for books (Project Gutenberg, etc.).
-        
-        Returns:
-            Dictionary defining book document structure
-        """
-        return {
-            "book_id": str,   # Unique identifier (Gutenberg ID, ISBN, etc.)
-            "source": str,    # Source type: "gutenberg", "archive_org"
-            "title": str,     # Book title
-            "authors": List[str],  # List of author names
-            "abstract": Optional[str],  # Book description/summary
-            "subjects": List[str],  # Book subjects/categories
-            "language": str,  # Book language
-            "date_published": Optional[datetime],  # Original publication date
-            "formats": List[Dict[str, str]],  # Available formats and URLs
-            "pdf_url": Optional[str],  # URL to PDF file
-            "pdf_downloaded": bool,  # Whether PDF has been downloaded
-            "pdf_file_path": Optional[str],  # Local path to downloaded PDF
-            "pdf_file_size": Optional[int],  # PDF file size in bytes
-            "source_metadata": Dict[str, Any],  # Source-specific metadata
-            "processing_status": str,  # Status: "pending", "processed", "error"
-            "created_at": datetime,  # Record creation time
-            "updated_at": datetime,  # Record update time
-        }
+    def to_bson(self) -> Dict[str, Any]:
+        """Convert to a MongoDB document."""
+        return _to_bson(self)
+
+
+@dataclass(slots=True)
+class Article:
+    """Article document from journals, magazines and blogs."""
+    article_id: str  # Unique identifier
+    source: str  # Source type: "journal", "magazine", "blog"
+    title: str  # Article title
+    authors: List[str] = field(default_factory=list)  # List of author names
+    abstract: Optional[str] = None  # Article abstract/summary
+    keywords: List[str] = field(default_factory=list)  # Article keywords
+    journal: Optional[str] = None  # Journal name
+    volume: Optional[str] = None  # Journal volume
+    issue: Optional[str] = None  # Journal issue
+    pages: Optional[str] = None  # Page numbers
+    doi: Optional[str] = None  # Digital Object Identifier
+    date_published: Optional[datetime] = None  # Publication date
+    pdf_url: Optional[str] = None  # URL to PDF file
+    web_url: Optional[str] = None  # URL to web version
+    pdf_downloaded: bool = False  # Whether PDF has been downloaded
+    pdf_file_path: Optional[str] = None  # Local path to downloaded PDF
+    pdf_file_size: Optional[int] = None  # PDF file size in bytes
+    source_metadata: Dict[str, Any] = field(default_factory=dict)  # Source-specific metadata
+    processing_status: str = "pending"  # Status: "pending", "processed", "error"
+    created_at: Optional[datetime] = None  # Record creation time
+    updated_at: Optional[datetime] = None  # Record update time
     
-    @staticmethod
-    def get_article_schema() -> Dict[str, Any]:
-        """
-        Schema for articles from various sources.
-        
-        Returns:
-            Dictionary defining article document structure
-        """
-        return {
-            "article_id": str,  # Unique identifier
-            "source": str,    # Source type: "journal", "magazine", "blog"
-            "title": str,     # Article title
-            "authors": List[str],  # List of author names
-            "abstract": Optional[str],  # Article abstract/summary
-            "keywords": List[str],  # Article keywords
-            "journal": Optional[str],  # Journal name
-            "volume": Optional[str],  # Journal volume
-            "issue": Optional[str],   # Journal issue
-            "pages": Optional[str],   # Page numbers
-            "doi": Optional[str],     # Digital Object Identifier
-            "date_published": datetime,  # Publication date
-            "pdf_url": Optional[str],  # URL to PDF file
-            "web_url": Optional[str],  # URL to web version
-            "pdf_downloaded": bool,  # Whether PDF has been downloaded
-            "pdf_file_path": Optional[str],  # Local path to downloaded PDF
-            "pdf_file_size": Optional[int],  # PDF file size in bytes
-            "source_metadata": Dict[str, Any],  # Source-specific metadata
-            "processing_status": str,  # Status: "pending", "processed", "error"
-            "created_at": datetime,  # Record creation time
-            "updated_at": datetime,  # Record update time
-        }
+    def to_bson(self) -> Dict[str, Any]:
+        """Convert to a MongoDB document."""
+        return _to_bson(self)
 
 
 class IndexDefinitions:
@@ -114,15 +160,22 @@ class IndexDefinitions:
     def get_paper_indexes() -> List[IndexModel]:
         """Get index definitions for papers collection."""
         return [
-            IndexModel([("paper_id", ASCENDING)], unique=True),
-            IndexModel([("source", ASCENDING)]),
-            IndexModel([("authors", ASCENDING)]),
-            IndexModel([("categories", ASCENDING)]),
-            IndexModel([("date_published", DESCENDING)]),
-            IndexModel([("processing_status", ASCENDING)]),
-            IndexModel([("pdf_downloaded", ASCENDING)]),
-            IndexModel([("title", TEXT), ("abstract", TEXT)], name="text_search"),
-            IndexModel([("created_at", DESCENDING)]),
+            # Every index costs a B-tree write per inserted paper; only keep
+            # those backing a query the scraper actually runs
+            IndexModel([("paper_id", ASCENDING)], unique=True),  # Upserts and lookups by ID
+            IndexModel([("date_published", DESCENDING)]),  # Recent-first listings
+            IndexModel([("processing_status", ASCENDING)]),  # Pipeline status queues
+            # Compound indexes for the scraper's combined filters; their left
+            # prefixes also serve source-, pdf_downloaded- and categories-only queries
+            IndexModel([("source", ASCENDING), ("processing_status", ASCENDING)]),
+            # Trailing paper_id/pdf_url make fetch_pending_downloads an index-only scan
+            IndexModel([("pdf_downloaded", ASCENDING), ("source", ASCENDING),
+                        ("processing_status", ASCENDING), ("paper_id", ASCENDING),
+                        ("pdf_url", ASCENDING)], name="pending_downloads"),
+            IndexModel([("categories", ASCENDING), ("date_published", DESCENDING)]),
+            # search_text; the date suffix lets published_after filter inside the index
+            IndexModel([("title", TEXT), ("abstract", TEXT), ("date_published", DESCENDING)],
+                       name="text_search"),
         ]
     
     @staticmethod
@@ -136,7 +189,8 @@ class IndexDefinitions:
             IndexModel([("language", ASCENDING)]),
             IndexModel([("processing_status", ASCENDING)]),
             IndexModel([("pdf_downloaded", ASCENDING)]),
-            IndexModel([("title", TEXT), ("abstract", TEXT)], name="text_search"),
+            IndexModel([("title", TEXT), ("abstract", TEXT), ("date_published", DESCENDING)],
+                       name="text_search"),
             IndexModel([("created_at", DESCENDING)]),
         ]
     
@@ -152,7 +206,8 @@ class IndexDefinitions:
             IndexModel([("date_published", DESCENDING)]),
             IndexModel([("processing_status", ASCENDING)]),
             IndexModel([("pdf_downloaded", ASCENDING)]),
-            IndexModel([("title", TEXT), ("abstract", TEXT), ("keywords", TEXT)], name="text_search"),
+            IndexModel([("title", TEXT), ("abstract", TEXT), ("keywords", TEXT),
+                        ("date_published", DESCENDING)], name="text_search"),
             IndexModel([("created_at", DESCENDING)]),
         ]
 
@@ -176,6 +231,37 @@ class MongoDBOperations:
         self.ARTICLES_COLLECTION = "articles"
         self.METADATA_COLLECTION = "metadata"
         
+        # Collection handles, bound once on first use
+        self.papers: Optional[Collection] = None
+        self.books: Optional[Collection] = None
+        self.articles: Optional[Collection] = None
+        self.metadata: Optional[Collection] = None
+        self._collections: Dict[str, Collection] = {}
+        
+    def _bind_collections(self):
+        """Connect and cache Collection handles for the known collections."""
+        self.database = self.connector.connect()
+        self.papers = self.database[self.PAPERS_COLLECTION]
+        self.books = self.database[self.BOOKS_COLLECTION]
+        self.articles = self.database[self.ARTICLES_COLLECTION]
+        self.metadata = self.database[self.METADATA_COLLECTION]
+        self._collections = {
+            self.PAPERS_COLLECTION: self.papers,
+            self.BOOKS_COLLECTION: self.books,
+            self.ARTICLES_COLLECTION: self.articles,
+            self.METADATA_COLLECTION: self.metadata,
+        }
+    
+    def _get_collection(self, collection_name: str) -> Collection:
+        """Return a cached Collection handle, connecting on first use."""
+        if self.database is None:
+            self._bind_collections()
+        
+        collection = self._collections.get(collection_name)
+        if collection is None:
+            collection = self._collections[collection_name] = self.database[collection_name]
+        return collection
+        
     def initialize_database(self) -> bool:
         """
         Initialize the database with collections and indexes.
@@ -184,8 +270,8 @@ class MongoDBOperations:
             True if initialization successful, False otherwise
         """
         try:
-            # Connect to database
-            self.database = self.connector.connect()
+            # Connect to database and cache collection handles
+            self._bind_collections()
             
             # Create collections and indexes
             self._create_collections_and_indexes()
@@ -204,28 +290,60 @@ class MongoDBOperations:
         """Create collections and their indexes."""
         # Papers collection
         papers_indexes = IndexDefinitions.get_paper_indexes()
-        self.connector.create_indexes(self.PAPERS_COLLECTION, papers_indexes)
+        self._create_indexes(self.PAPERS_COLLECTION, papers_indexes, retired=_RETIRED_PAPER_INDEXES)
         logger.info(f"Created indexes for {self.PAPERS_COLLECTION} collection")
         
         # Books collection
         books_indexes = IndexDefinitions.get_book_indexes()
-        self.connector.create_indexes(self.BOOKS_COLLECTION, books_indexes)
+        self._create_indexes(self.BOOKS_COLLECTION, books_indexes)
         logger.info(f"Created indexes for {self.BOOKS_COLLECTION} collection")
         
         # Articles collection
         articles_indexes = IndexDefinitions.get_article_indexes()
-        self.connector.create_indexes(self.ARTICLES_COLLECTION, articles_indexes)
+        self._create_indexes(self.ARTICLES_COLLECTION, articles_indexes)
         logger.info(f"Created indexes for {self.ARTICLES_COLLECTION} collection")
+    
+    def _create_indexes(self, collection_name: str, indexes: List[IndexModel],
+                        retired: Tuple[str, ...] = ()):
+        """Create indexes, rebuilding the text index if an older definition exists."""
+        if retired:
+            self._drop_retired_indexes(collection_name, retired)
+        
+        try:
+            self.connector.create_indexes(collection_name, indexes)
+        except OperationFailure as e:
+            if e.code not in _INDEX_CONFLICT_CODES:
+                raise
+            # Only one text index is allowed per collection, so the old one must go first
+            logger.warning(f"Rebuilding text_search index on {collection_name}: {e}")
+            self._get_collection(collection_name).drop_index("text_search")
+            self.connector.create_indexes(collection_name, indexes)
+    
+    def _drop_retired_indexes(self, collection_name: str, retired: Tuple[str, ...]):
+        """Drop indexes no longer in the definitions that an older version created."""
+        collection = self._get_collection(collection_name)
+        existing = {index["name"] for index in collection.list_indexes()}
+        for name in retired:
+            if name not in existing:
+                continue
+            try:
+                collection.drop_index(name)
+                logger.info(f"Dropped retired index {name} on {collection_name}")
+            except OperationFailure as e:
+                # Another process may have dropped it since list_indexes()
+                if e.code != _INDEX_NOT_FOUND_CODE:
+                    raise
         
     def _initialize_metadata_collection(self):
         """Initialize metadata collection for tracking system information."""
-        metadata_collection = self.connector.get_collection(self.METADATA_COLLECTION)
+        metadata_collection = self._get_collection(self.METADATA_COLLECTION)
         
         # Insert initial metadata if not exists
+        current_time = datetime.now(_UTC)
         metadata_doc = {
             "system_info": {
                 "database_version": "1.0",
-                "created_at": datetime.utcnow(),
+                "created_at": current_time,
                 "storage_location": "/mnt/data/mongodb",
                 "max_storage_gb": 300,
             },
@@ -234,7 +352,7 @@ class MongoDBOperations:
                 "books": {"schema_version": "1.0"},
                 "articles": {"schema_version": "1.0"},
             },
-            "updated_at": datetime.utcnow()
+            "updated_at": current_time
         }
         
         metadata_collection.replace_one(
@@ -243,25 +361,31 @@ class MongoDBOperations:
             upsert=True
         )
     
-    def insert_paper(self, paper_data: Dict[str, Any]) -> bool:
+    def insert_paper(self, paper_data: Union[Paper, Dict[str, Any]],
+                     now: Optional[datetime] = None) -> bool:
         """
         Insert a paper document.
         
         Args:
-            paper_data: Paper metadata dictionary
+            paper_data: Paper instance or paper metadata dictionary
+            now: Timestamp to record, so callers inserting in a loop can share one
             
         Returns:
             True if successful, False otherwise
         """
+        if isinstance(paper_data, Paper):
+            paper_data = paper_data.to_bson()
+        current_time = now or datetime.now(_UTC)
+        
         try:
             paper_data.update({
-                "created_at": datetime.utcnow(),
-                "updated_at": datetime.utcnow(),
+                "created_at": current_time,
+                "updated_at": current_time,
                 "processing_status": paper_data.get("processing_status", "pending"),
                 "pdf_downloaded": paper_data.get("pdf_downloaded", False),
             })
             
-            collection = self.connector.get_collection(self.PAPERS_COLLECTION)
+            collection = self._get_collection(self.PAPERS_COLLECTION)
             collection.insert_one(paper_data)
             
             logger.debug(f"Inserted paper: {paper_data.get('paper_id')}")
@@ -274,65 +398,212 @@ class MongoDBOperations:
             logger.error(f"Failed to insert paper: {e}")
             return False
     
-    def bulk_insert_papers(self, papers_data: List[Dict[str, Any]]) -> Dict[str, int]:
+    def bulk_insert_papers(self, papers_data: List[Union[Paper, Dict[str, Any]]]) -> Dict[str, int]:
         """
-        Bulk insert paper documents.
+        Bulk insert paper documents, skipping papers that already exist.
+        
+        Each paper becomes an upsert keyed on paper_id, so a batch that overlaps
+        earlier feeds completes in one round-trip; existing papers only have
+        their updated_at refreshed.
         
         Args:
-            papers_data: List of paper metadata dictionaries
+            papers_data: List of Paper instances or paper metadata dictionaries
             
         Returns:
-            Dictionary with insertion statistics
+            Dictionary with inserted, duplicate and error counts
         """
         if not papers_data:
-            return {"inserted": 0, "errors": 0}
+            return {"inserted": 0, "duplicates": 0, "errors": 0}
         
-        # Add timestamps and default values
-        current_time = datetime.utcnow()
-        for paper in papers_data:
-            paper.update({
-                "created_at": current_time,
-                "updated_at": current_time,
-                "processing_status": paper.get("processing_status", "pending"),
-                "pdf_downloaded": paper.get("pdf_downloaded", False),
-            })
+        operations, missing_ids = self._build_paper_upserts(papers_data)
+        if not operations:
+            return {"inserted": 0, "duplicates": 0, "errors": missing_ids}
         
-        collection = self.connector.get_collection(self.PAPERS_COLLECTION)
+        collection = self._get_collection(self.PAPERS_COLLECTION)
         
         try:
-            result = collection.insert_many(papers_data, ordered=False)
-            inserted_count = len(result.inserted_ids)
+            result = collection.bulk_write(operations, ordered=False)
+            inserted_count = result.upserted_count
+            duplicate_count = result.matched_count
             
-            logger.info(f"Bulk inserted {inserted_count} papers")
-            return {"inserted": inserted_count, "errors": 0}
+            logger.info(f"Bulk inserted {inserted_count} papers, {duplicate_count} already present")
+            return {"inserted": inserted_count, "duplicates": duplicate_count, "errors": missing_ids}
             
         except BulkWriteError as e:
-            inserted_count = e.details.get("nInserted", 0)
-            error_count = len(e.details.get("writeErrors", []))
+            inserted_count = e.details.get("nUpserted", 0)
+            duplicate_count = e.details.get("nMatched", 0)
+            error_count = len(e.details.get("writeErrors", [])) + missing_ids
             
             logger.warning(f"Bulk insert completed with {inserted_count} inserted, {error_count} errors")
-            return {"inserted": inserted_count, "errors": error_count}
+            return {"inserted": inserted_count, "duplicates": duplicate_count, "errors": error_count}
         
         except Exception as e:
             logger.error(f"Bulk insert failed: {e}")
-            return {"inserted": 0, "errors": len(papers_data)}
+            return {"inserted": 0, "duplicates": 0, "errors": len(papers_data)}
     
-    def find_papers(self, query: Dict[str, Any], limit: int = 100) -> List[Dict[str, Any]]:
+    async def bulk_insert_papers_async(self, papers_data: List[Union[Paper, Dict[str, Any]]],
+                                       chunk_size: int = 1000, max_concurrency: int = 8) -> Dict[str, int]:
         """
-        Find papers matching query.
+        Bulk insert paper documents in concurrent chunks with the async client.
+        
+        Same upsert semantics as bulk_insert_papers(); chunks are written in
+        parallel so BSON encoding of one overlaps the round-trip of another.
+        
+        Args:
+            papers_data: List of Paper instances or paper metadata dictionaries
+            chunk_size: Number of upserts per bulk_write call
+            max_concurrency: Maximum number of chunks in flight at once
+            
+        Returns:
+            Dictionary with inserted, duplicate and error counts
+        """
+        if not papers_data:
+            return {"inserted": 0, "duplicates": 0, "errors": 0}
+        
+        operations, missing_ids = self._build_paper_upserts(papers_data)
+        if not operations:
+            return {"inserted": 0, "duplicates": 0, "errors": missing_ids}
+        
+        database = self.connector.get_async_client()[self.connector.database_name]
+        collection = database[self.PAPERS_COLLECTION]
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def write(chunk: List[UpdateOne]) -> Dict[str, int]:
+            async with semaphore:
+                try:
+                    result = await collection.bulk_write(chunk, ordered=False)
+                    return {
+                        "inserted": result.upserted_count,
+                        "duplicates": result.matched_count,
+                        "errors": 0,
+                    }
+                except BulkWriteError as e:
+                    return {
+                        "inserted": e.details.get("nUpserted", 0),
+                        "duplicates": e.details.get("nMatched", 0),
+                        "errors": len(e.details.get("writeErrors", [])),
+                    }
+                except Exception as e:
+                    logger.error(f"Bulk insert chunk failed: {e}")
+                    return {"inserted": 0, "duplicates": 0, "errors": len(chunk)}
+        
+        chunk_results = await asyncio.gather(*(
+            write(operations[start:start + chunk_size])
+            for start in range(0, len(operations), chunk_size)
+        ))
+        
+        totals = {"inserted": 0, "duplicates": 0, "errors": missing_ids}
+        for chunk_result in chunk_results:
+            for key, count in chunk_result.items():
+                totals[key] += count
+        
+        logger.info(f"Bulk inserted {totals['inserted']} papers, {totals['duplicates']} already present, "
+                    f"{totals['errors']} errors")
+        return totals
+    
+    def _build_paper_upserts(self, papers_data: List[Union[Paper, Dict[str, Any]]]
+                             ) -> Tuple[List[UpdateOne], int]:
+        """
+        Stamp papers with timestamps and defaults and build their upserts.
+        
+        Args:
+            papers_data: List of Paper instances or paper metadata dictionaries;
+                dictionaries are updated in place
+            
+        Returns:
+            Tuple of (upsert operations, number of papers skipped for lacking a paper_id)
+        """
+        current_time = datetime.now(_UTC)
+        timestamp_update = {"updated_at": current_time}
+        
+        operations = []
+        missing_ids = 0
+        for paper in papers_data:
+            if isinstance(paper, Paper):
+                paper = paper.to_bson()
+            # Add timestamps and default values in place
+            paper["created_at"] = current_time
+            paper["updated_at"] = current_time
+            paper.setdefault("processing_status", "pending")
+            paper.setdefault("pdf_downloaded", False)
+            
+            paper_id = paper.get("paper_id")
+            if paper_id is None:
+                missing_ids += 1
+                continue
+            # updated_at goes in $set; a field cannot appear in both operators
+            insert_fields = paper.copy()
+            del insert_fields["updated_at"]
+            operations.append(UpdateOne(
+                {"paper_id": paper_id},
+                {"$setOnInsert": insert_fields, "$set": timestamp_update},
+                upsert=True
+            ))
+        
+        if missing_ids:
+            logger.warning(f"Skipped {missing_ids} papers without a paper_id")
+        return operations, missing_ids
+    
+    def find_papers(self, query: Dict[str, Any], limit: int = 100,
+                    projection: Optional[Dict[str, Any]] = None,
+                    batch_size: int = 500) -> Cursor:
+        """
+        Find papers matching query, streaming results in batches.
+        
+        The caller must exhaust the cursor or close() it; a cursor is always
+        truthy, so use find_papers_list() when an emptiness check is needed.
+        
+        Args:
+            query: MongoDB query dictionary
+            limit: Maximum number of results
+            projection: Fields to return (defaults to PAPER_LIST_PROJECTION)
+            batch_size: Documents fetched per round trip
+            
+        Returns:
+            Cursor over paper documents
+        """
+        collection = self._get_collection(self.PAPERS_COLLECTION)
+        cursor = collection.find(query, projection or PAPER_LIST_PROJECTION)
+        return cursor.batch_size(batch_size).limit(limit)
+    
+    def find_papers_list(self, query: Dict[str, Any], limit: int = 100,
+                         projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Find papers matching query and load them all into memory.
         
         Args:
             query: MongoDB query dictionary
             limit: Maximum number of results
+            projection: Fields to return (defaults to PAPER_LIST_PROJECTION)
             
         Returns:
             List of paper documents
         """
-        collection = self.connector.get_collection(self.PAPERS_COLLECTION)
-        cursor = collection.find(query).limit(limit)
+        return list(self.find_papers(query, limit, projection, batch_size=limit))
+    
+    def fetch_pending_downloads(self, source: str, limit: int = 1000) -> List[Dict[str, Any]]:
+        """
+        Fetch papers still waiting for a PDF download.
+        
+        The query and projection are covered by the pending_downloads index,
+        so the server answers without reading any paper documents.
+        
+        Args:
+            source: Paper source, e.g. "arxiv"
+            limit: Maximum number of results
+            
+        Returns:
+            List of dictionaries with paper_id and pdf_url
+        """
+        collection = self._get_collection(self.PAPERS_COLLECTION)
+        cursor = collection.find(
+            {"pdf_downloaded": False, "source": source, "processing_status": "pending"},
+            {"_id": 0, "paper_id": 1, "pdf_url": 1}
+        ).hint("pending_downloads").limit(limit)
         return list(cursor)
     
-    def update_paper_download_status(self, paper_id: str, file_path: str, file_size: int) -> bool:
+    def update_paper_download_status(self, paper_id: str, file_path: str, file_size: int,
+                                     now: Optional[datetime] = None) -> bool:
         """
         Update paper download status.
         
@@ -340,12 +611,13 @@ class MongoDBOperations:
             paper_id: Paper identifier
             file_path: Path to downloaded PDF
             file_size: File size in bytes
+            now: Timestamp to record, so callers updating in a loop can share one
             
         Returns:
             True if successful, False otherwise
         """
         try:
-            collection = self.connector.get_collection(self.PAPERS_COLLECTION)
+            collection = self._get_collection(self.PAPERS_COLLECTION)
             result = collection.update_one(
                 {"paper_id": paper_id},
                 {
@@ -353,7 +625,7 @@ class MongoDBOperations:
                         "pdf_downloaded": True,
                         "pdf_file_path": file_path,
                         "pdf_file_size": file_size,
-                        "updated_at": datetime.utcnow()
+                        "updated_at": now or datetime.now(_UTC)
                     }
                 }
             )
@@ -364,6 +636,48 @@ class MongoDBOperations:
             logger.error(f"Failed to update download status for {paper_id}: {e}")
             return False
     
+    def bulk_update_download_status(self, updates: List[Tuple[str, str, int]]) -> int:
+        """
+        Mark several papers as downloaded in one round-trip.
+        
+        Args:
+            updates: List of (paper_id, file_path, file_size) tuples
+            
+        Returns:
+            Number of papers updated
+        """
+        if not updates:
+            return 0
+        
+        current_time = datetime.now(_UTC)
+        operations = [
+            UpdateOne(
+                {"paper_id": paper_id},
+                {
+                    "$set": {
+                        "pdf_downloaded": True,
+                        "pdf_file_path": file_path,
+                        "pdf_file_size": file_size,
+                        "updated_at": current_time
+                    }
+                }
+            )
+            for paper_id, file_path, file_size in updates
+        ]
+        
+        try:
+            collection = self._get_collection(self.PAPERS_COLLECTION)
+            return collection.bulk_write(operations, ordered=False).modified_count
+            
+        except BulkWriteError as e:
+            logger.warning(f"Download status update completed with "
+                           f"{len(e.details.get('writeErrors', []))} errors")
+            return e.details.get("nModified", 0)
+        
+        except Exception as e:
+            logger.error(f"Failed to update download status for {len(updates)} papers: {e}")
+            return 0
+    
     def get_collection_stats(self) -> Dict[str, Any]:
         """
         Get statistics for all collections.
@@ -374,17 +688,34 @@ class MongoDBOperations:
         stats = {}
         collections = [self.PAPERS_COLLECTION, self.BOOKS_COLLECTION, self.ARTICLES_COLLECTION]
         
+        # All three counts in a single pass and round-trip per collection
+        pipeline = [{
+            "$group": {
+                "_id": None,
+                "document_count": {"$sum": 1},
+                "downloaded_count": {
+                    "$sum": {"$cond": [{"$eq": ["$pdf_downloaded", True]}, 1, 0]}
+                },
+                "pending_count": {
+                    "$sum": {"$cond": [{"$eq": ["$processing_status", "pending"]}, 1, 0]}
+                },
+            }
+        }]
+        
         for collection_name in collections:
-            collection = self.connector.get_collection(collection_name)
+            collection = self._get_collection(collection_name)
+            counts = next(collection.aggregate(pipeline), {})
             stats[collection_name] = {
-                "document_count": collection.count_documents({}),
-                "downloaded_count": collection.count_documents({"pdf_downloaded": True}),
-                "pending_count": collection.count_documents({"processing_status": "pending"}),
+                "document_count": counts.get("document_count", 0),
+                "downloaded_count": counts.get("downloaded_count", 0),
+                "pending_count": counts.get("pending_count", 0),
             }
         
         return stats
     
-    def search_text(self, search_term: str, collection_name: str = None, limit: int = 50) -> List[Dict[str, Any]]:
+    def search_text(self, search_term: str, collection_name: str = None, limit: int = 50,
+                    projection: Optional[Dict[str, Any]] = None,
+                    published_after: Optional[datetime] = None) -> List[Dict[str, Any]]:
         """
         Perform text search across collections.
         
@@ -392,36 +723,97 @@ class MongoDBOperations:
             search_term: Text to search for
             collection_name: Specific collection to search (optional)
             limit: Maximum number of results
+            projection: Fields to return (defaults to SEARCH_RESULT_PROJECTION)
+            published_after: Only match documents published at or after this date
             
         Returns:
             List of matching documents
         """
-        results = []
         collections = [collection_name] if collection_name else [
             self.PAPERS_COLLECTION, self.BOOKS_COLLECTION, self.ARTICLES_COLLECTION
         ]
         
-        for coll_name in collections:
-            collection = self.connector.get_collection(coll_name)
-            cursor = collection.find(
-                {"$text": {"$search": search_term}},
-                {"score": {"$meta": "textScore"}}
-            ).sort([("score", {"$meta": "textScore"})]).limit(limit)
+        projection = _search_projection(projection or SEARCH_RESULT_PROJECTION)
+        text_filter = _text_filter(search_term, published_after)
+        
+        # Top matches per collection, merged and cut to `limit` on the server
+        first, *others = collections
+        pipeline = self._text_search_stages(text_filter, first, limit, projection)
+        for coll_name in others:
+            pipeline.append({
+                "$unionWith": {
+                    "coll": coll_name,
+                    "pipeline": self._text_search_stages(text_filter, coll_name, limit, projection)
+                }
+            })
+        if others:
+            pipeline.extend([{"$sort": {"score": -1}}, {"$limit": limit}])
+        
+        return list(self._get_collection(first).aggregate(pipeline))
+    
+    @staticmethod
+    def _text_search_stages(text_filter: Dict[str, Any], coll_name: str, limit: int,
+                            projection: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Aggregation stages returning one collection's best text matches."""
+        return [
+            {"$match": text_filter},
+            {"$addFields": {"score": {"$meta": "textScore"}, "_collection": coll_name}},
+            {"$sort": {"score": -1}},
+            {"$limit": limit},
+            {"$project": projection},
+        ]
+    
+    async def search_text_async(self, search_term: str, collection_name: str = None, limit: int = 50,
+                                projection: Optional[Dict[str, Any]] = None,
+                                published_after: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Perform text search across collections concurrently with the async client.
+        
+        Args:
+            search_term: Text to search for
+            collection_name: Specific collection to search (optional)
+            limit: Maximum number of results
+            projection: Fields to return (defaults to SEARCH_RESULT_PROJECTION)
+            published_after: Only match documents published at or after this date
             
-            for doc in cursor:
+        Returns:
+            List of matching documents
+        """
+        database = self.connector.get_async_client()[self.connector.database_name]
+        projection = {
+            **_search_projection(projection or SEARCH_RESULT_PROJECTION),
+            "score": {"$meta": "textScore"},
+        }
+        projection.pop("_collection", None)
+        text_filter = _text_filter(search_term, published_after)
+        collections = [collection_name] if collection_name else [
+            self.PAPERS_COLLECTION, self.BOOKS_COLLECTION, self.ARTICLES_COLLECTION
+        ]
+        
+        async def search(coll_name: str) -> List[Dict[str, Any]]:
+            cursor = database[coll_name].find(text_filter, projection).sort([("score", {"$meta": "textScore"})]).limit(limit)
+            
+            docs = await cursor.to_list(limit)
+            for doc in docs:
                 doc["_collection"] = coll_name
-                results.append(doc)
+            return docs
+        
+        batches = await asyncio.gather(*(search(coll_name) for coll_name in collections))
+        results = [doc for docs in batches for doc in docs]
         
         return sorted(results, key=lambda x: x.get("score", 0), reverse=True)[:limit]
 
 
 # Global operations instance
 _operations: Optional[MongoDBOperations] = None
+_operations_lock = threading.Lock()
 
 
 def get_operations() -> MongoDBOperations:
     """Get global MongoDB operations instance."""
     global _operations
     if _operations is None:
-        _operations = MongoDBOperations()
+        with _operations_lock:
+            if _operations is None:
+                _operations = MongoDBOperations()
     return _operations
\ No newline at end of file
@@ -3,6 +3,6 @@ MCP Servers module for arXiv scraper project.
 Provides integration with external MCP servers for enhanced functionality.
 """
 
-from .client_manager import MCPClientManager
+from .client_manager import MCPClientManager, MCPRateLimitError
 
-__all__ = ["MCPClientManager"]
+__all__ = ["MCPClientManager", "MCPRateLimitError"]
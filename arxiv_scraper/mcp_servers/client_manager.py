@@ -11,6 +11,14 @@ from dataclasses import dataclass, field
 from enum import Enum
 
 
+class MCPRateLimitError(RuntimeError):
+    """Raised when an MCP server answers a tool call with HTTP 429."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 class ServerStatus(Enum):
     DISCONNECTED = "disconnected"
     CONNECTING = "connecting"
@@ -57,12 +65,15 @@ class HTTPMCPClient(MCPClient):
         super().__init__(config)
         self.session = None
     
-    async def connect(self) -> bool:
+    async def connect(self, connector=None) -> bool:
         import aiohttp
         try:
             self.status = ServerStatus.CONNECTING
+            # A connector passed in is shared with other clients and outlives this session
             self.session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=self.config.timeout)
+                timeout=aiohttp.ClientTimeout(total=self.config.timeout),
+                connector=connector,
+                connector_owner=connector is None
             )
             
             # Test connection with health check
@@ -96,6 +107,12 @@ class HTTPMCPClient(MCPClient):
             async with self.session.post(url, json=parameters) as response:
                 if response.status == 200:
                     return await response.json()
+                elif response.status == 429:
+                    retry_after = response.headers.get("Retry-After")
+                    raise MCPRateLimitError(
+                        f"Rate limited by {self.config.name}",
+                        retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None
+                    )
                 else:
                     error_text = await response.text()
                     raise RuntimeError(f"Tool call failed: {error_text}")
@@ -123,6 +140,11 @@ class MCPClientManager:
         self.configs: Dict[str, MCPServerConfig] = {}
         self.logger = logging.getLogger("mcp.manager")
         
+        # One connection pool for all HTTP clients, created on first connect
+        self._shared_connector = None
+        # In-flight connects by server, so concurrent callers share one client
+        self._connecting: Dict[str, asyncio.Task] = {}
+        
         # Initialize default server configurations
         self._setup_default_configs()
     
@@ -165,20 +187,55 @@ class MCPClientManager:
             self.logger.error(f"Unknown server: {server_name}")
             return False
         
+        # Agents share this manager; keep an existing session rather than replacing it
+        if self.is_server_connected(server_name):
+            return True
+        
+        task = self._connecting.get(server_name)
+        if task is None:
+            task = asyncio.ensure_future(self._connect_server(server_name))
+            self._connecting[server_name] = task
+            task.add_done_callback(lambda _: self._connecting.pop(server_name, None))
+        # Shielded so one caller being cancelled doesn't fail the others
+        return await asyncio.shield(task)
+    
+    async def _connect_server(self, server_name: str) -> bool:
+        if server_name in self.clients:
+            await self.disconnect_server(server_name)
+        
         config = self.configs[server_name]
         client = HTTPMCPClient(config)
         
-        if await client.connect():
+        if await client.connect(self._get_connector()):
             self.clients[server_name] = client
             return True
         else:
+            # Close the session the failed attempt opened
+            await client.disconnect()
             return False
     
+    def _get_connector(self):
+        """Return the connector shared by all HTTP clients, creating it if needed."""
+        import aiohttp
+        if self._shared_connector is None or self._shared_connector.closed:
+            # Idle connections outlive the gaps between scraper batches
+            self._shared_connector = aiohttp.TCPConnector(
+                limit=128, limit_per_host=32, ttl_dns_cache=300, keepalive_timeout=75
+            )
+        return self._shared_connector
+    
     async def connect_all_servers(self) -> Dict[str, bool]:
+        # Connects are independent, so startup waits for the slowest server only
+        names = list(self.configs)
+        outcomes = await asyncio.gather(
+            *(self.connect_server(name) for name in names), return_exceptions=True
+        )
         results = {}
-        
-        for server_name in self.configs:
-            results[server_name] = await self.connect_server(server_name)
+        for server_name, outcome in zip(names, outcomes):
+            if isinstance(outcome, Exception):
+                self.logger.error(f"Connection failed to {server_name}: {outcome}")
+                outcome = False
+            results[server_name] = outcome
         
         connected_count = sum(results.values())
         self.logger.info(f"Connected to {connected_count}/{len(self.configs)} servers")
@@ -191,8 +248,14 @@ class MCPClientManager:
             del self.clients[server_name]
     
     async def disconnect_all_servers(self) -> None:
-        for server_name in list(self.clients.keys()):
-            await self.disconnect_server(server_name)
+        await asyncio.gather(
+            *(self.disconnect_server(name) for name in list(self.clients.keys())),
+            return_exceptions=True
+        )
+        
+        if self._shared_connector is not None:
+            await self._shared_connector.close()
+            self._shared_connector = None
     
     async def call_tool(self, server_name: str, tool_name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
         if server_name not in self.clients:
@@ -214,14 +277,16 @@ class MCPClientManager:
         }
     
     async def health_check_all(self) -> Dict[str, bool]:
+        names = list(self.clients.keys())
+        outcomes = await asyncio.gather(
+            *(self.clients[name].health_check() for name in names), return_exceptions=True
+        )
         results = {}
-        
-        for server_name, client in self.clients.items():
-            try:
-                results[server_name] = await client.health_check()
-            except Exception as e:
-                self.logger.error(f"Health check failed for {server_name}: {e}")
-                results[server_name] = False
+        for server_name, outcome in zip(names, outcomes):
+            if isinstance(outcome, Exception):
+                self.logger.error(f"Health check failed for {server_name}: {outcome}")
+                outcome = False
+            results[server_name] = outcome
         
         return results
     
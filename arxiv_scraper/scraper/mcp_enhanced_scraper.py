@@ -6,14 +6,48 @@ Uses Unstructured MCP and arXiv MCP for content parsing and metadata extraction.
 import asyncio
 import logging
 from typing import Dict, List, Any, Optional, Union
-from datetime import datetime
+from datetime import datetime, timezone
 from dataclasses import dataclass
 import json
+import random
 import re
 
-from ..mcp_servers.client_manager import mcp_manager
+from ..mcp_servers.client_manager import MCPRateLimitError, mcp_manager
 from ..utils.logger import get_logger
 
+_WHITESPACE_RE = re.compile(r"\s+")
+_ABSTRACT_RE = re.compile(r"abstract", re.IGNORECASE)
+
+# Formats tried when a date is not ISO 8601, and the format that last matched a
+# string of each length so homogeneous feeds hit it on the first attempt
+_DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%Y-%m-%dT%H:%M:%SZ",
+    "%Y-%m-%dT%H:%M:%S.%fZ",
+    "%a, %d %b %Y %H:%M:%S %Z"
+)
+_date_format_cache: Dict[int, str] = {}
+
+
+def _normalize(text: str) -> str:
+    """Collapse whitespace runs to single spaces and trim the ends."""
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def _parse_html_document(html_content: str):
+    """Parse HTML with lxml's C parser; None when there is no document to parse."""
+    from lxml import etree, html as lxml_html
+    
+    try:
+        try:
+            return lxml_html.document_fromstring(html_content)
+        except ValueError:
+            # str input may not carry an XML encoding declaration; parse the bytes
+            return lxml_html.document_fromstring(html_content.encode("utf-8"))
+    except etree.ParserError:
+        # Empty input, or a declaration with nothing after it
+        return None
+
 
 @dataclass
 class ScrapedPaper:
@@ -52,16 +86,23 @@ class ScrapingResult:
 
 
 class MCPEnhancedScraperAgent:
-    def __init__(self):
+    def __init__(self, max_concurrency: int = 16):
         self.logger = get_logger(__name__)
+        # Bounds in-flight MCP calls when a batch is processed concurrently
+        self.max_concurrency = max_concurrency
+        self.concurrency = asyncio.Semaphore(max_concurrency)
         
     async def initialize(self) -> bool:
         """Initialize MCP connections required for scraping."""
         required_servers = ["unstructured", "arxiv"]
-        connection_results = {}
-        
-        for server in required_servers:
-            connection_results[server] = await mcp_manager.connect_server(server)
+        # Servers another agent already connected keep their session and connections
+        results = await asyncio.gather(
+            *(mcp_manager.connect_server(server) for server in required_servers),
+            return_exceptions=True
+        )
+        connection_results = {
+            server: result is True for server, result in zip(required_servers, results)
+        }
         
         success_count = sum(connection_results.values())
         self.logger.info(f"Connected to {success_count}/{len(required_servers)} scraper MCP servers")
@@ -80,16 +121,21 @@ class MCPEnhancedScraperAgent:
         papers = []
         errors = []
         
-        for i, data in enumerate(raw_data):
-            try:
-                paper = await self._parse_single_metadata(data, source)
-                if paper:
-                    papers.append(paper)
-                    
-            except Exception as e:
-                error_msg = f"Metadata parsing failed for item {i}: {str(e)}"
+        async def parse_one(data: Dict[str, Any]) -> Optional[ScrapedPaper]:
+            async with self.concurrency:
+                return await self._parse_single_metadata(data, source)
+        
+        outcomes = await asyncio.gather(
+            *(parse_one(data) for data in raw_data), return_exceptions=True
+        )
+        
+        for i, outcome in enumerate(outcomes):
+            if isinstance(outcome, Exception):
+                error_msg = f"Metadata parsing failed for item {i}: {str(outcome)}"
                 self.logger.error(error_msg)
                 errors.append(error_msg)
+            elif outcome:
+                papers.append(outcome)
         
         self.logger.info(f"Parsed {len(papers)} papers from {len(raw_data)} raw items")
         
@@ -115,11 +161,9 @@ class MCPEnhancedScraperAgent:
             self.logger.warning("Unstructured MCP server not connected, skipping PDF extraction")
             return {}
         
-        extracted_texts = {}
-        
-        for url in pdf_urls:
-            try:
-                response = await mcp_manager.call_tool(
+        async def extract_one(url: str) -> Dict[str, Any]:
+            async with self.concurrency:
+                return await self._call_with_retry(
                     "unstructured",
                     "extract_pdf",
                     {
@@ -129,19 +173,25 @@ class MCPEnhancedScraperAgent:
                         "chunk_elements": True
                     }
                 )
-                
-                if response.get("success") and response.get("elements"):
-                    # Combine text elements
-                    text_parts = []
-                    for element in response["elements"]:
-                        if element.get("text"):
-                            text_parts.append(element["text"])
-                    
-                    extracted_texts[url] = " ".join(text_parts)
-                    self.logger.info(f"Extracted text from PDF: {url}")
-                
-            except Exception as e:
-                self.logger.error(f"PDF extraction failed for {url}: {e}")
+        
+        # Each extraction is a round trip to the server, so overlap them
+        responses = await asyncio.gather(
+            *(extract_one(url) for url in pdf_urls), return_exceptions=True
+        )
+        
+        extracted_texts = {}
+        
+        for url, response in zip(pdf_urls, responses):
+            if isinstance(response, Exception):
+                self.logger.error(f"PDF extraction failed for {url}: {response}")
+                continue
+            
+            if response.get("success") and response.get("elements"):
+                # Combine text elements
+                extracted_texts[url] = " ".join(
+                    element["text"] for element in response["elements"] if element.get("text")
+                )
+                self.logger.info(f"Extracted text from PDF: {url}")
                 
         return extracted_texts
     
@@ -158,7 +208,7 @@ class MCPEnhancedScraperAgent:
             return await self._basic_html_parse(html_content, source_url)
         
         try:
-            response = await mcp_manager.call_tool(
+            response = await self._call_with_retry(
                 "unstructured",
                 "extract_html",
                 {
@@ -187,11 +237,16 @@ class MCPEnhancedScraperAgent:
         Args:
             papers: List of scraped papers to clean
         """
+        # Pure string work; run it in a worker so large batches don't stall the loop
+        return await asyncio.to_thread(self._clean_papers, papers)
+    
+    def _clean_papers(self, papers: List[ScrapedPaper]) -> List[ScrapedPaper]:
+        """Clean and validate papers synchronously; see clean_data."""
         cleaned_papers = []
         
         for paper in papers:
             try:
-                cleaned_paper = await self._clean_single_paper(paper)
+                cleaned_paper = self._clean_single_paper(paper)
                 if self._is_valid_paper(cleaned_paper):
                     cleaned_papers.append(cleaned_paper)
                 else:
@@ -218,29 +273,28 @@ class MCPEnhancedScraperAgent:
             self.logger.warning("Unstructured MCP not connected, using basic preprocessing")
             return [self._basic_nlp_preprocessing(paper) for paper in papers]
         
-        preprocessed_papers = []
-        
-        for paper in papers:
+        async def preprocess_one(paper: ScrapedPaper) -> Optional[Dict[str, Any]]:
             try:
                 # Combine title, abstract, and any processed text
                 full_text = f"{paper.title}\n\n{paper.abstract}"
                 if paper.processed_text:
                     full_text += f"\n\n{paper.processed_text}"
                 
-                response = await mcp_manager.call_tool(
-                    "unstructured",
-                    "preprocess_text",
-                    {
-                        "text": full_text,
-                        "clean": True,
-                        "normalize": True,
-                        "extract_keywords": True,
-                        "split_sentences": True
-                    }
-                )
+                async with self.concurrency:
+                    response = await self._call_with_retry(
+                        "unstructured",
+                        "preprocess_text",
+                        {
+                            "text": full_text,
+                            "clean": True,
+                            "normalize": True,
+                            "extract_keywords": True,
+                            "split_sentences": True
+                        }
+                    )
                 
                 if response.get("success"):
-                    preprocessed_data = {
+                    return {
                         "paper_id": f"{paper.source_url or paper.title}_{paper.date_scraped}",
                         "title": paper.title,
                         "authors": paper.authors,
@@ -252,14 +306,71 @@ class MCPEnhancedScraperAgent:
                         "sentences": response.get("sentences", []),
                         "metadata": paper.raw_metadata
                     }
-                    preprocessed_papers.append(preprocessed_data)
                 
             except Exception as e:
                 self.logger.error(f"NLP preprocessing failed for paper: {e}")
                 # Add basic preprocessing as fallback
-                preprocessed_papers.append(self._basic_nlp_preprocessing(paper))
+                return self._basic_nlp_preprocessing(paper)
+            
+            return None
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(papers)
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in enumerate(papers):
+            queue.put_nowait(item)
+        
+        # A fixed pool of workers keeps one coroutine per slot, not one per paper
+        async def worker():
+            while True:
+                i, paper = await queue.get()
+                try:
+                    results[i] = await preprocess_one(paper)
+                finally:
+                    queue.task_done()
+        
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(min(self.max_concurrency, len(papers)))
+        ]
+        try:
+            await queue.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
         
-        return preprocessed_papers
+        return [result for result in results if result is not None]
+    
+    async def _call_with_retry(self, server: str, tool_name: str, parameters: Dict[str, Any],
+                               max_attempts: int = 3, base: float = 0.5,
+                               cap: float = 8.0) -> Dict[str, Any]:
+        """
+        Call an MCP tool, retrying throttling and timeouts with exponential backoff.
+        
+        Other failures are raised immediately, as is the last attempt's error.
+        """
+        for attempt in range(max_attempts):
+            try:
+                return await mcp_manager.call_tool(server, tool_name, parameters)
+            except (MCPRateLimitError, asyncio.TimeoutError) as e:
+                error = e
+            except RuntimeError as e:
+                message = str(e).lower()
+                # Tool errors carry the server's response text; retry only throttling
+                if not ("429" in message or "rate limit" in message or "quota" in message):
+                    raise
+                error = e
+            
+            if attempt == max_attempts - 1:
+                raise error
+            
+            delay = getattr(error, "retry_after", None) or min(cap, base * 2 ** attempt)
+            delay += random.random() * 0.1
+            self.logger.warning(
+                f"{server}.{tool_name} throttled or timed out, retrying in {delay:.1f}s "
+                f"(attempt {attempt + 1}/{max_attempts})"
+            )
+            await asyncio.sleep(delay)
     
     async def _parse_single_metadata(self, data: Dict[str, Any], 
                                    source: str) -> Optional[ScrapedPaper]:
@@ -283,7 +394,7 @@ class MCPEnhancedScraperAgent:
             try:
                 arxiv_id = data.get("id", "").split("/")[-1]  # Extract ID from URL
                 
-                response = await mcp_manager.call_tool(
+                response = await self._call_with_retry(
                     "arxiv",
                     "get_paper",
                     {"arxiv_id": arxiv_id}
@@ -346,17 +457,14 @@ class MCPEnhancedScraperAgent:
             
             if element_type == "Title" and not title:
                 title = text
-            elif element_type == "NarrativeText" and "abstract" in text.lower():
+            elif element_type == "NarrativeText" and _ABSTRACT_RE.search(text):
                 abstract = text
             elif text:
                 content_parts.append(text)
         
         # If no abstract found in elements, try to extract from content
-        if not abstract and content_parts:
-            for part in content_parts:
-                if "abstract" in part.lower():
-                    abstract = part
-                    break
+        if not abstract:
+            abstract = next((part for part in content_parts if _ABSTRACT_RE.search(part)), "")
         
         return ScrapedPaper(
             title=title or "Extracted Content",
@@ -369,19 +477,19 @@ class MCPEnhancedScraperAgent:
     
     async def _basic_html_parse(self, html_content: str, source_url: str) -> ScrapedPaper:
         """Basic HTML parsing fallback."""
-        from bs4 import BeautifulSoup
-        
-        soup = BeautifulSoup(html_content, 'html.parser')
+        document = _parse_html_document(html_content)
         
         title = ""
-        if soup.title:
-            title = soup.title.get_text()
+        title_elem = document.find(".//title") if document is not None else None
+        if title_elem is not None:
+            title = title_elem.text_content()
         
-        # Try to find abstract
+        # Try to find abstract: the first text node that mentions it
         abstract = ""
-        abstract_elem = soup.find(string=re.compile("abstract", re.IGNORECASE))
-        if abstract_elem:
-            abstract = abstract_elem.get_text()
+        if document is not None:
+            abstract = next(
+                (text for text in document.itertext() if _ABSTRACT_RE.search(text)), ""
+            )
         
         return ScrapedPaper(
             title=title,
@@ -391,19 +499,15 @@ class MCPEnhancedScraperAgent:
             raw_metadata={"html_length": len(html_content)}
         )
     
-    async def _clean_single_paper(self, paper: ScrapedPaper) -> ScrapedPaper:
+    def _clean_single_paper(self, paper: ScrapedPaper) -> ScrapedPaper:
         """Clean a single paper's data."""
-        # Clean title
-        paper.title = re.sub(r'\s+', ' ', paper.title).strip()
-        
-        # Clean abstract
-        paper.abstract = re.sub(r'\s+', ' ', paper.abstract).strip()
+        # Clean title and abstract
+        paper.title = _normalize(paper.title)
+        paper.abstract = _normalize(paper.abstract)
         
-        # Clean authors
-        paper.authors = [author.strip() for author in paper.authors if author.strip()]
-        
-        # Clean categories
-        paper.categories = [cat.strip() for cat in paper.categories if cat.strip()]
+        # Clean authors and categories, normalizing each entry once
+        paper.authors = [author for author in map(_normalize, paper.authors) if author]
+        paper.categories = [cat for cat in map(_normalize, paper.categories) if cat]
         
         return paper
     
@@ -436,19 +540,30 @@ class MCPEnhancedScraperAgent:
         if isinstance(date_str, datetime):
             return date_str
         
-        # Try common date formats
-        date_formats = [
-            "%Y-%m-%d",
-            "%Y-%m-%dT%H:%M:%SZ",
-            "%Y-%m-%dT%H:%M:%S.%fZ",
-            "%a, %d %b %Y %H:%M:%S %Z"
-        ]
+        # ISO 8601 covers arXiv's dates; fromisoformat is implemented in C
+        try:
+            parsed = datetime.fromisoformat(date_str[:-1] if date_str.endswith("Z") else date_str)
+        except ValueError:
+            pass
+        else:
+            # Dates are kept as naive UTC, as strptime returned for the "Z" formats
+            if parsed.tzinfo is not None:
+                parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+            return parsed
+        
+        # Try common date formats, starting with the last one that fit this length
+        cached_format = _date_format_cache.get(len(date_str))
+        date_formats = _DATE_FORMATS
+        if cached_format:
+            date_formats = (cached_format,) + tuple(f for f in _DATE_FORMATS if f != cached_format)
         
         for fmt in date_formats:
             try:
-                return datetime.strptime(date_str, fmt)
+                parsed = datetime.strptime(date_str, fmt)
             except ValueError:
                 continue
+            _date_format_cache[len(date_str)] = fmt
+            return parsed
         
         self.logger.warning(f"Could not parse date: {date_str}")
         return None
@@ -0,0 +1,103 @@
+"""
+Bloom filter utilities for the arXiv scraper project.
+"""
+
+import hashlib
+import math
+import os
+import struct
+from pathlib import Path
+from typing import Iterable, Iterator
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings that can be saved to disk.
+
+    Membership tests never give false negatives; false positives occur at
+    roughly ``error_rate`` once ``capacity`` items have been added.
+    """
+
+    # num_bits, num_hashes
+    _HEADER = struct.Struct("<QI")
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.001):
+        """
+        Initialize an empty filter.
+
+        Args:
+            capacity: Expected number of items
+            error_rate: Target false positive rate at capacity
+        """
+        num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_bits = num_bits
+        self.num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        self._bits = bytearray((num_bits + 7) // 8)
+
+    def _positions(self, item: str) -> Iterator[int]:
+        """Yield the bit positions for an item using double hashing."""
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str) -> None:
+        """Add an item to the filter."""
+        bits = self._bits
+        for pos in self._positions(item):
+            bits[pos >> 3] |= 1 << (pos & 7)
+
+    def update(self, items: Iterable[str]) -> None:
+        """Add several items to the filter."""
+        for item in items:
+            self.add(item)
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def save(self, path: str) -> None:
+        """
+        Write the filter to disk, replacing any previous file atomically.
+
+        Args:
+            path: Destination file path
+        """
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_suffix(target.suffix + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(self._HEADER.pack(self.num_bits, self.num_hashes))
+            f.write(self._bits)
+        os.replace(tmp_path, target)
+
+    @classmethod
+    def load(cls, path: str) -> "BloomFilter":
+        """
+        Read a filter previously written by save().
+
+        Args:
+            path: Source file path
+
+        Returns:
+            BloomFilter with the stored size and contents
+
+        Raises:
+            ValueError: If the file is truncated or malformed
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+
+        if len(data) < cls._HEADER.size:
+            raise ValueError(f"Bloom filter file too short: {path}")
+        num_bits, num_hashes = cls._HEADER.unpack_from(data)
+        bits = bytearray(data[cls._HEADER.size:])
+        if num_hashes < 1 or len(bits) != (num_bits + 7) // 8:
+            raise ValueError(f"Corrupt bloom filter file: {path}")
+
+        bloom = cls.__new__(cls)
+        bloom.num_bits = num_bits
+        bloom.num_hashes = num_hashes
+        bloom._bits = bits
+        return bloom
@@ -9,56 +9,58 @@ from typing import Optional
 
 class RateLimiter:
     """
-    Simple rate limiter for API calls and web requests.
+    Token-bucket rate limiter for API calls and web requests.
+
+    Tokens refill at one per ``delay`` seconds up to ``burst_size``. Each
+    call to wait() reserves its release time before sleeping, so concurrent
+    callers are released in arrival order, each with a single timer.
     """
-    
+
     def __init__(self, delay: float = 1.0, burst_size: Optional[int] = None):
         """
         Initialize rate limiter.
-        
+
         Args:
-            delay: Minimum delay between calls in seconds
-            burst_size: Optional burst allowance (not implemented yet)
+            delay: Minimum average delay between calls in seconds
+            burst_size: Number of calls allowed back-to-back after an idle
+                period (defaults to 1, i.e. strict spacing)
         """
         self.delay = delay
         self.burst_size = burst_size
-        self.last_call_time = 0.0
-        
+        # Theoretical time at which the bucket is empty again
+        self.next_slot_time = 0.0
+
+    @property
+    def _burst_window(self) -> float:
+        """Seconds of credit the bucket can hold beyond the next slot."""
+        return (max(self.burst_size or 1, 1) - 1) * self.delay
+
     async def wait(self) -> None:
         """
         Wait if necessary to maintain rate limit.
         """
-        current_time = time.time()
-        time_since_last_call = current_time - self.last_call_time
-        
-        if time_since_last_call < self.delay:
-            wait_time = self.delay - time_since_last_call
-            await asyncio.sleep(wait_time)
-        
-        self.last_call_time = time.time()
-    
+        # Reserve the slot synchronously; no await happens between read and write
+        current_time = time.monotonic()
+        slot_time = max(current_time, self.next_slot_time - self._burst_window)
+        self.next_slot_time = max(self.next_slot_time, current_time) + self.delay
+
+        if slot_time > current_time:
+            await asyncio.sleep(slot_time - current_time)
+
     def can_proceed(self) -> bool:
         """
         Check if we can proceed without waiting.
-        
+
         Returns:
             True if we can proceed immediately
         """
-        current_time = time.time()
-        time_since_last_call = current_time - self.last_call_time
-        return time_since_last_call >= self.delay
-    
+        return self.time_until_next_call() == 0.0
+
     def time_until_next_call(self) -> float:
         """
         Get time remaining until next call is allowed.
-        
+
         Returns:
             Seconds until next call is allowed (0 if can proceed now)
         """
-        current_time = time.time()
-        time_since_last_call = current_time - self.last_call_time
-        
-        if time_since_last_call >= self.delay:
-            return 0.0
-        else:
-            return self.delay - time_since_last_call
\ No newline at end of file
+        return max(0.0, self.next_slot_time - self._burst_window - time.monotonic())
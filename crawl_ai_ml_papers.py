@@ -116,10 +116,13 @@ class AIMLPaperCrawler:
         try:
             stored_count = 0
             duplicate_count = 0
+            stored_at = datetime.now(timezone.utc)
             
             for paper in papers:
                 # Check if paper already exists
-                existing_papers = self.db_ops.find_papers({"paper_id": paper.get('paper_id')})
+                existing_papers = self.db_ops.find_papers_list(
+                    {"paper_id": paper.get('paper_id')}, limit=1, projection={"_id": 1}
+                )
                 
                 if existing_papers:
                     duplicate_count += 1
@@ -127,7 +130,7 @@ class AIMLPaperCrawler:
                     continue
                 
                 # Store new paper
-                result = self.db_ops.insert_paper(paper)
+                result = self.db_ops.insert_paper(paper, now=stored_at)
                 if result:
                     stored_count += 1
                     logger.debug(f"Stored paper: {paper.get('title', 'Unknown')}")
@@ -207,7 +210,10 @@ class AIMLPaperCrawler:
         db_initialized = await self.initialize_database()
         
         # Step 2: Crawl papers
-        papers = await self.crawl_recent_ai_ml_papers(max_papers)
+        try:
+            papers = await self.crawl_recent_ai_ml_papers(max_papers)
+        finally:
+            await self.crawler.close()
         
         # Step 3: Store to database (if available)
         storage_success = False
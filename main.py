@@ -16,6 +16,7 @@ from pathlib import Path
 from arxiv_scraper.crawler.arxiv_api import ArxivCrawler
 from arxiv_scraper.scraper.metadata_parser import PaperMetadataProcessor
 from arxiv_scraper.scraper.pdf_downloader import StorageManager, PDFDownloader
+from arxiv_scraper.database.mongodb_connector import close_global_connector
 from arxiv_scraper.database.mongodb_operations import get_operations
 from arxiv_scraper.utils.logger import get_logger
 
@@ -64,20 +65,21 @@ async def run_scraper(args):
         # Crawl papers
         logger.info(f"Crawling up to {args.max_papers} papers...")
         
-        if args.categories:
-            categories = args.categories.split(',')
-            papers = await crawler.crawl_specific_categories(
-                categories=categories,
-                max_papers=args.max_papers,
-                days_back=args.days_back
-            )
-        else:
-            # Default: AI/ML papers
-            papers = await crawler.crawl_ai_ml_papers(
-                max_papers=args.max_papers,
-                days_back=args.days_back,
-                additional_keywords=args.keywords.split(',') if args.keywords else None
-            )
+        async with crawler:
+            if args.categories:
+                categories = args.categories.split(',')
+                papers = await crawler.crawl_specific_categories(
+                    categories=categories,
+                    max_papers=args.max_papers,
+                    days_back=args.days_back
+                )
+            else:
+                # Default: AI/ML papers
+                papers = await crawler.crawl_ai_ml_papers(
+                    max_papers=args.max_papers,
+                    days_back=args.days_back,
+                    additional_keywords=args.keywords.split(',') if args.keywords else None
+                )
         
         if not papers:
             logger.error("No papers crawled")
@@ -98,7 +100,7 @@ async def run_scraper(args):
         # Store in database
         logger.info("Storing in database...")
         result = db_ops.bulk_insert_papers(processed_papers)
-        logger.info(f"Stored {result['inserted']} papers, {result['errors']} errors")
+        logger.info(f"Stored {result['inserted']} papers, {result['duplicates']} already present, {result['errors']} errors")
         
         # Download PDFs if requested
         if args.download_pdfs:
@@ -115,15 +117,11 @@ async def run_scraper(args):
                            f"({stats['total_size_mb']:.1f}MB)")
                 
                 # Update database with download status
-                updated_count = 0
-                for paper in updated_papers:
-                    if paper.get("pdf_downloaded", False):
-                        if db_ops.update_paper_download_status(
-                            paper["paper_id"],
-                            paper["pdf_file_path"],
-                            paper["pdf_file_size"]
-                        ):
-                            updated_count += 1
+                updated_count = db_ops.bulk_update_download_status([
+                    (paper["paper_id"], paper["pdf_file_path"], paper["pdf_file_size"])
+                    for paper in updated_papers
+                    if paper.get("pdf_downloaded", False)
+                ])
                 
                 logger.info(f"Updated download status for {updated_count} papers")
         
@@ -150,6 +148,10 @@ async def run_scraper(args):
     except Exception as e:
         logger.error(f"Scraper run failed: {e}", exc_info=True)
         return False
+    
+    finally:
+        # Closes the sync client and this loop's async client before asyncio.run exits
+        await close_global_connector()
 
 
 def main():
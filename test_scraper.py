@@ -65,11 +65,12 @@ async def test_complete_pipeline():
         # Step 2: Crawl papers from arXiv
         logger.info("Step 2: Crawling 20 AI/ML papers from arXiv...")
         
-        papers = await crawler.crawl_ai_ml_papers(
-            max_papers=20,
-            days_back=90,  # Last 90 days for more content
-            additional_keywords=["transformer", "llm", "gpt", "bert"]
-        )
+        async with crawler:
+            papers = await crawler.crawl_ai_ml_papers(
+                max_papers=20,
+                days_back=90,  # Last 90 days for more content
+                additional_keywords=["transformer", "llm", "gpt", "bert"]
+            )
         
         if not papers:
             logger.error("No papers crawled from arXiv")
@@ -117,16 +118,11 @@ async def test_complete_pipeline():
         # Step 6: Update database with download information
         logger.info("Step 6: Updating database with download status...")
         
-        updated_count = 0
-        for paper in updated_papers:
-            if paper.get("pdf_downloaded", False):
-                success = db_ops.update_paper_download_status(
-                    paper["paper_id"],
-                    paper["pdf_file_path"],
-                    paper["pdf_file_size"]
-                )
-                if success:
-                    updated_count += 1
+        updated_count = db_ops.bulk_update_download_status([
+            (paper["paper_id"], paper["pdf_file_path"], paper["pdf_file_size"])
+            for paper in updated_papers
+            if paper.get("pdf_downloaded", False)
+        ])
         
         logger.info(f"✓ Updated download status for {updated_count} papers")
         
@@ -180,8 +176,8 @@ async def quick_test_crawler():
     """Quick test of just the crawler component."""
     logger.info("Running quick crawler test...")
     
-    crawler = ArxivCrawler()
-    papers = await crawler.crawl_ai_ml_papers(max_papers=5, days_back=3)
+    async with ArxivCrawler() as crawler:
+        papers = await crawler.crawl_ai_ml_papers(max_papers=5, days_back=3)
     
     print(f"\nCrawled {len(papers)} papers:")
     for paper in papers:
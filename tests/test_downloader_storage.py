@@ -0,0 +1,128 @@
+"""
+Tests for the downloader's content-addressed PDF storage.
+
+PDFs are stored once under cas/ by checksum and hardlinked at their per-paper
+paths; these tests exercise that layout, the storage counters and cleanup
+against a temporary storage directory, without any network access.
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+
+from arxiv_scraper.downloader_agent import (
+    MCPEnhancedDownloaderAgent,
+    _file_checksum,
+    _scan_storage,
+)
+
+
+def _pdf(tag: str, size: int = 4096) -> bytes:
+    """Build distinct PDF-looking content of a given size."""
+    body = f"%PDF-1.7 {tag} ".encode()
+    return body + b"x" * (size - len(body))
+
+
+def _store(agent: MCPEnhancedDownloaderAgent, content: bytes, name: str) -> Path:
+    """Store content the way a finished download is committed; return its path."""
+    tmp_path = agent._tmp_download_path()
+    tmp_path.write_bytes(content)
+    local_path = agent.storage_path / name[0] / name
+    agent._commit_to_cas(tmp_path, _file_checksum(tmp_path), local_path)
+    return local_path
+
+
+def _blobs(agent: MCPEnhancedDownloaderAgent):
+    return sorted(agent._cas_dir.glob("*/*"))
+
+
+@pytest_asyncio.fixture
+async def agent(tmp_path):
+    agent = MCPEnhancedDownloaderAgent(storage_path=str(tmp_path / "papers"))
+    # Load the counters so commits are tracked incrementally from here on
+    await agent.get_storage_stats()
+    yield agent
+    await agent.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_duplicate_content_is_stored_once(agent):
+    content = _pdf("a")
+    first = _store(agent, content, "p1.pdf")
+    second = _store(agent, content, "p2.pdf")
+
+    blobs = _blobs(agent)
+    assert len(blobs) == 1
+    assert os.path.samefile(first, second)
+    assert os.path.samefile(first, blobs[0])
+    assert second.read_bytes() == content
+    # The stored copy plus two per-paper links
+    assert blobs[0].stat().st_nlink == 3
+    assert list(agent._tmp_dir.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_storage_stats_count_unique_content(agent):
+    shared, unique = _pdf("shared", 8192), _pdf("unique", 3000)
+    _store(agent, shared, "p1.pdf")
+    _store(agent, shared, "p2.pdf")
+    _store(agent, unique, "p3.pdf")
+
+    stats = await agent.get_storage_stats()
+    assert stats.total_files == 3
+    assert round(stats.total_size_gb * 1024**3) == len(shared) + len(unique)
+    # Incremental counters agree with a full rescan of the tree
+    assert _scan_storage(agent.storage_path) == (3, len(shared) + len(unique))
+
+
+@pytest.mark.asyncio
+async def test_manage_storage_keeps_blobs_still_linked(agent):
+    shared = _pdf("shared")
+    shared_links = [_store(agent, shared, f"s{i}.pdf") for i in range(3)]
+    # Hardlinks share an inode, so all three links are the oldest files
+    os.utime(shared_links[0], (1, 1))
+    others = [_store(agent, _pdf(f"other{i}"), f"o{i}.pdf") for i in range(17)]
+    for i, path in enumerate(others):
+        os.utime(path, (100 + i, 100 + i))
+
+    # Oldest 10% of 20 files: two of the three links to the shared PDF
+    report = await agent.manage_storage(cleanup_threshold=0.0)
+
+    assert report["removed_old_files"] == 2
+    assert report["freed_space_gb"] == 0
+    remaining = [path for path in shared_links if path.exists()]
+    assert len(remaining) == 1
+    assert remaining[0].read_bytes() == shared
+    assert len(_blobs(agent)) == 18
+    assert remaining[0].stat().st_nlink == 2
+
+    stats = await agent.get_storage_stats()
+    assert stats.total_files == 18
+    assert round(stats.total_size_gb * 1024**3) == 18 * len(shared)
+    assert _scan_storage(agent.storage_path) == (18, 18 * len(shared))
+
+
+@pytest.mark.asyncio
+async def test_manage_storage_removes_unlinked_blobs(agent):
+    kept, dropped = _pdf("kept", 5000), _pdf("dropped", 7000)
+    kept_path = _store(agent, kept, "k.pdf")
+    dropped_path = _store(agent, dropped, "d.pdf")
+
+    assert agent._remove_paper_file(dropped_path) == 0  # the stored copy remains
+    assert len(_blobs(agent)) == 2
+
+    # Too few files for the old-file pass; only orphaned blobs are collected
+    report = await agent.manage_storage(cleanup_threshold=0.0)
+
+    assert report["removed_old_files"] == 0
+    assert round(report["freed_space_gb"] * 1024**3) == len(dropped)
+    blobs = _blobs(agent)
+    assert len(blobs) == 1
+    assert os.path.samefile(blobs[0], kept_path)
+    assert kept_path.read_bytes() == kept
+
+    stats = await agent.get_storage_stats()
+    assert stats.total_files == 1
+    assert round(stats.total_size_gb * 1024**3) == len(kept)
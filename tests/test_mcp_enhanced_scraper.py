@@ -0,0 +1,39 @@
+"""
+Tests for the scraper agent's basic HTML parsing fallback.
+
+Without the Unstructured MCP server, extract_html_content parses pages with
+lxml; input lxml cannot build a document from must give empty fields rather
+than an exception.
+"""
+
+import pytest
+
+from arxiv_scraper.scraper.mcp_enhanced_scraper import MCPEnhancedScraperAgent
+
+XML_DECLARATION = '<?xml version="1.0" encoding="utf-8"?>'
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("html_content", ["", "   \n", XML_DECLARATION])
+async def test_basic_html_parse_without_document(html_content):
+    agent = MCPEnhancedScraperAgent()
+
+    paper = await agent.extract_html_content(html_content, "https://example.org/p")
+
+    assert paper.title == ""
+    assert paper.abstract == ""
+    assert paper.source_url == "https://example.org/p"
+
+
+@pytest.mark.asyncio
+async def test_basic_html_parse_with_encoding_declaration():
+    agent = MCPEnhancedScraperAgent()
+    html_content = (
+        f"{XML_DECLARATION}<html><head><title>A Paper</title></head>"
+        "<body><p>Intro</p><div>The <b>Abstract</b> follows</div></body></html>"
+    )
+
+    paper = await agent.extract_html_content(html_content, "https://example.org/p")
+
+    assert paper.title == "A Paper"
+    assert paper.abstract == "Abstract"